@@ -1,88 +1,367 @@
-"""Embedded file bridge server — runs as a daemon thread inside the companion."""
+"""File bridge server — runs as a daemon thread inside the companion.
 
+tools/file_bridge.py serves the same commands standalone; the protocol is
+documented there.
+"""
+
+import codecs
+import gzip
+import io
+import mmap
+import os
+import queue
 import socket
 import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+_CHUNK = 65536  # first read chunk, sent together with the SIZE header
+
+# Encoded `list` replies: dir -> (mtime_ns, size, built_at, payload, gzipped
+# payload or None), LRU order.
+# An entry is reused while the directory's stat is unchanged and it is younger
+# than _LIST_TTL, which covers filesystems with coarse mtime resolution.
+_LIST_TTL = 2.0
+_LIST_CACHE_SIZE = 32
+_list_cache: OrderedDict[Path, tuple[int, int, float, bytes, bytes | None]] = OrderedDict()
+_list_lock = threading.Lock()
+
+# Contents of small files: path -> (mtime_ns, size, data), LRU order, bounded
+# by total bytes, so repeated reads of the same crops skip open/read entirely
+_FILE_CACHE_MAX = 256 * 1024
+_FILE_CACHE_BYTES = 64 * 1024 * 1024
+_file_cache: OrderedDict[Path, tuple[int, int, bytes]] = OrderedDict()
+_file_cache_bytes = 0
+_file_lock = threading.Lock()
+
+_recv_local = threading.local()
+
+# Request log lines: (time, message), printed by one daemon thread so
+# handlers never wait on stdout (slow console locking on Windows)
+_log_queue: queue.SimpleQueue[tuple[float, str]] = queue.SimpleQueue()
+_logger: threading.Thread | None = None
 
 
 def _safe_path(rel_path: str) -> Path | None:
+    # Lexical escapes are refused without touching the filesystem. The
+    # realpath() walk runs on every request: a directory under the root can
+    # be swapped for a symlink at any time, so its result is never cached
+    norm = os.path.normpath(rel_path)
+    if os.path.isabs(norm) or norm == os.pardir or norm.startswith(os.pardir + os.sep):
+        return None
     try:
-        full = (PROJECT_ROOT / rel_path).resolve()
-        if not str(full).startswith(str(PROJECT_ROOT)):
-            return None
-        return full
+        full = (PROJECT_ROOT / norm).resolve()
     except (ValueError, OSError):
         return None
+    # Component-wise, so a sibling such as "<root>_evil" is not inside
+    return full if full.is_relative_to(PROJECT_ROOT) else None
 
 
-def _handle_client(conn, addr):
+def _log(message: str):
+    _log_queue.put_nowait((time.time(), message))
+
+
+def _log_writer():
+    while True:
+        stamp, message = _log_queue.get()
+        print(f"[bridge {time.strftime('%H:%M:%S', time.localtime(stamp))}] {message}")
+
+
+def _start_logger():
+    global _logger
+    if _logger is None:
+        _logger = threading.Thread(target=_log_writer, name="bridge-log", daemon=True)
+        _logger.start()
+
+
+def _listing(path: Path, compressed: bool = False) -> bytes:
+    """Newline-terminated, sorted names of the files in ``path``, encoded.
+
+    With ``compressed`` the same reply is returned gzipped; the gzip is
+    built on first request and kept alongside the plain listing.
+    """
+    st = path.stat()
+    now = time.monotonic()
+    with _list_lock:
+        hit = _list_cache.get(path)
+        if (hit is not None and hit[:2] == (st.st_mtime_ns, st.st_size)
+                and now - hit[2] < _LIST_TTL):
+            _list_cache.move_to_end(path)
+            if not compressed:
+                return hit[3]
+            if hit[4] is not None:
+                return hit[4]
+            now, payload = hit[2], hit[3]
+        else:
+            hit = None
+    if hit is None:
+        # DirEntry.is_file answers from d_type, without a stat per entry
+        with os.scandir(path) as it:
+            files = sorted(e.name for e in it if e.is_file(follow_symlinks=False))
+        payload = b"\n".join(map(os.fsencode, files)) + b"\n"
+    packed = gzip.compress(payload, mtime=0) if compressed else None
+    with _list_lock:
+        _list_cache[path] = (st.st_mtime_ns, st.st_size, now, payload, packed)
+        _list_cache.move_to_end(path)
+        if len(_list_cache) > _LIST_CACHE_SIZE:
+            _list_cache.popitem(last=False)
+    return packed if compressed else payload
+
+
+def _open_ro(path: Path) -> io.FileIO:
+    """Unbuffered read-only handle; skips the atime update where allowed."""
+    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
     try:
-        conn.settimeout(30)
-        data = b""
-        while b"\n" not in data and len(data) < 4096:
-            chunk = conn.recv(4096)
-            if not chunk:
+        fd = os.open(path, flags | getattr(os, "O_NOATIME", 0))
+    except PermissionError:  # O_NOATIME is refused on files we don't own
+        fd = os.open(path, flags)
+    return io.FileIO(fd, "rb")
+
+
+def _advise(f: io.FileIO, advice: str):
+    """posix_fadvise the whole file, by constant name; a no-op on Windows."""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, getattr(os, advice))
+
+
+def _small_file(path: Path, st: os.stat_result) -> bytes | None:
+    """Contents of ``path`` if it is small enough to cache, else None."""
+    global _file_cache_bytes
+    if st.st_size > _FILE_CACHE_MAX:
+        return None
+    with _file_lock:
+        hit = _file_cache.get(path)
+        if hit is not None and hit[:2] == (st.st_mtime_ns, st.st_size):
+            _file_cache.move_to_end(path)
+            return hit[2]
+    with _open_ro(path) as f:
+        data = f.readall()
+    if len(data) != st.st_size:  # changed under us; serve it, don't keep it
+        return data
+    with _file_lock:
+        old = _file_cache.pop(path, None)
+        if old is not None:
+            _file_cache_bytes -= len(old[2])
+        _file_cache[path] = (st.st_mtime_ns, st.st_size, data)
+        _file_cache_bytes += len(data)
+        while _file_cache_bytes > _FILE_CACHE_BYTES:
+            _file_cache_bytes -= len(_file_cache.popitem(last=False)[1][2])
+    return data
+
+
+def _send_parts(conn: socket.socket, parts: list[bytes]) -> None:
+    """Send ``parts`` back to back, as one writev() where sendmsg exists."""
+    if not hasattr(conn, "sendmsg"):  # Windows
+        conn.sendall(b"".join(parts))
+        return
+    views = [memoryview(p) for p in parts if p]
+    while views:
+        sent = conn.sendmsg(views)
+        while views and sent >= len(views[0]):
+            sent -= len(views.pop(0))
+        if views:
+            views[0] = views[0][sent:]
+
+
+def _recv_request(conn) -> bytes:
+    """Bytes received up to the first newline (or 4 KiB), plus any excess."""
+    # One buffer per pool thread, reused across connections: recv_into
+    # fills it in place, and only the final bytes() allocates
+    buf = getattr(_recv_local, "buf", None)
+    if buf is None:
+        buf = _recv_local.buf = bytearray(4096)
+    with memoryview(buf) as view:
+        n = 0
+        while n < len(buf):
+            got = conn.recv_into(view[n:])
+            if not got:
                 break
-            data += chunk
+            n += got
+            if buf.find(b"\n", n - got, n) >= 0:
+                break
+        return bytes(view[:n])
 
-        if not data:
-            return
 
-        command = data.decode("utf-8", errors="replace").strip()
-        print(f"[bridge {time.strftime('%H:%M:%S')}] {addr}: {command}")
+def _dir_arg(conn, rest: bytes) -> Path | None:
+    rel_dir = rest.decode("utf-8", errors="replace").strip()
+    path = _safe_path(rel_dir)
+    if path is None or not path.is_dir():
+        conn.sendall(f"ERROR: directory not found: {rel_dir}\n".encode())
+        return None
+    return path
 
-        if not command:
-            conn.sendall(b"ERROR: empty command\n")
-            return
 
-        if command == "ping":
-            conn.sendall(b"pong\n")
-            return
+def _file_arg(conn, rest: bytes) -> Path | None:
+    rel_file = rest.decode("utf-8", errors="replace").strip()
+    path = _safe_path(rel_file)
+    if path is None or not path.is_file():
+        conn.sendall(f"ERROR: file not found: {rel_file}\n".encode())
+        return None
+    return path
 
-        if command.startswith("list "):
-            rel_dir = command[5:].strip()
-            path = _safe_path(rel_dir)
-            if path is None or not path.is_dir():
-                conn.sendall(f"ERROR: directory not found: {rel_dir}\n".encode())
-                return
-            files = sorted(p.name for p in path.iterdir() if p.is_file())
-            conn.sendall(("\n".join(files) + "\n").encode())
-            return
 
-        if command.startswith("read "):
-            rel_file = command[5:].strip()
-            path = _safe_path(rel_file)
-            if path is None or not path.is_file():
-                conn.sendall(f"ERROR: file not found: {rel_file}\n".encode())
-                return
-            size = path.stat().st_size
-            conn.sendall(f"SIZE {size}\n".encode())
-            with open(path, "rb") as f:
-                while True:
-                    chunk = f.read(65536)
-                    if not chunk:
-                        break
-                    conn.sendall(chunk)
+def _send_file(conn, f: io.FileIO, offset: int, count: int):
+    """Send ``count`` bytes of ``f`` starting at ``offset``."""
+    if hasattr(os, "sendfile"):
+        # Page cache straight to the socket, no user-space copy
+        conn.sendfile(f, offset=offset, count=count)
+        return
+    # Without os.sendfile (Windows) socket.sendfile degrades to 8 KiB
+    # send() calls; a 64 KiB read/sendall loop is faster
+    f.seek(offset)
+    while count > 0 and (chunk := f.read(min(count, _CHUNK))):
+        conn.sendall(chunk)
+        count -= len(chunk)
+
+
+def _cmd_ping(conn, rest: bytes):
+    conn.sendall(b"pong\n")
+
+
+def _cmd_list(conn, rest: bytes):
+    if (path := _dir_arg(conn, rest)) is not None:
+        conn.sendall(_listing(path))
+
+
+def _cmd_listgz(conn, rest: bytes):
+    if (path := _dir_arg(conn, rest)) is not None:
+        packed = _listing(path, compressed=True)
+        _send_parts(conn, [f"GZIP {len(packed)}\n".encode(), packed])
+
+
+def _cmd_read(conn, rest: bytes):
+    if (path := _file_arg(conn, rest)) is None:
+        return
+    st = path.stat()
+    data = _small_file(path, st)
+    if data is not None:
+        # len(data), not st_size: the file may have changed since the stat
+        _send_parts(conn, [f"SIZE {len(data)}\n".encode(), data])
+        return
+    with _open_ro(path) as f:
+        # The SIZE line rides in the same write as the first chunk
+        first = f.read(_CHUNK)
+        _send_parts(conn, [f"SIZE {st.st_size}\n".encode(), first])
+        if st.st_size > len(first):
+            _send_file(conn, f, len(first), st.st_size - len(first))
+        _advise(f, "POSIX_FADV_DONTNEED")
+
+
+def _cmd_readrange(conn, rest: bytes):
+    # The path may contain spaces; offset and length are the last two
+    rel_file, _, span = rest.strip().rpartition(b" ")
+    rel_file, _, start = rel_file.rpartition(b" ")
+    try:
+        offset, length = int(start), int(span)
+    except ValueError:
+        conn.sendall(b"ERROR: usage: readrange <path> <offset> <length>\n")
+        return
+    if (path := _file_arg(conn, rel_file)) is None:
+        return
+    st = path.stat()
+    data = _small_file(path, st)
+    # Check against the bytes actually read when the file came from the cache
+    size = st.st_size if data is None else len(data)
+    if offset < 0 or length < 0 or offset + length > size:
+        conn.sendall(f"ERROR: range outside file of {size} bytes\n".encode())
+        return
+    header = f"SIZE {length}\n".encode()
+    if data is not None:
+        _send_parts(conn, [header, memoryview(data)[offset:offset + length]])
+        return
+    with _open_ro(path) as f:
+        f.seek(offset)
+        first = f.read(min(length, _CHUNK))
+        _send_parts(conn, [header, first])
+        if length > len(first):
+            _send_file(conn, f, offset + len(first), length - len(first))
+        _advise(f, "POSIX_FADV_DONTNEED")
+
+
+def _cmd_readtext(conn, rest: bytes):
+    if (path := _file_arg(conn, rest)) is None:
+        return
+    data = _small_file(path, path.stat())
+    if data is not None:
+        conn.sendall(data)
+        return
+    # Pass the file through as stored: map it and send the mapping,
+    # with no heap copy and no decode/encode round-trip
+    with _open_ro(path) as f:
+        _advise(f, "POSIX_FADV_SEQUENTIAL")
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                conn.sendall(mm)
+        _advise(f, "POSIX_FADV_DONTNEED")
+
+
+def _cmd_readtext_sanitize(conn, rest: bytes):
+    if (path := _file_arg(conn, rest)) is None:
+        return
+    data = _small_file(path, path.stat())
+    if data is not None:
+        # The strict C decoder doubles as a validator: valid files go out as
+        # stored, and only invalid ones pay for the replace round-trip
+        try:
+            data.decode("utf-8")
+        except UnicodeDecodeError:
+            data = data.decode("utf-8", errors="replace").encode()
+        conn.sendall(data)
+        return
+    # Invalid UTF-8 becomes U+FFFD; chunked, so memory stays flat
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with _open_ro(path) as f:
+        while chunk := f.read(_CHUNK):
+            conn.sendall(decoder.decode(chunk).encode())
+        _advise(f, "POSIX_FADV_DONTNEED")
+    conn.sendall(decoder.decode(b"", final=True).encode())
+
+
+# Command verb -> handler(conn, rest of the line as bytes)
+_COMMANDS = {
+    b"ping": _cmd_ping,
+    b"list": _cmd_list,
+    b"listgz": _cmd_listgz,
+    b"read": _cmd_read,
+    b"readrange": _cmd_readrange,
+    b"readtext": _cmd_readtext,
+    b"readtext-sanitize": _cmd_readtext_sanitize,
+}
+
+
+def _handle_client(conn, addr):
+    try:
+        conn.settimeout(30)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        data = _recv_request(conn)
+
+        if not data:
             return
 
-        if command.startswith("readtext "):
-            rel_file = command[9:].strip()
-            path = _safe_path(rel_file)
-            if path is None or not path.is_file():
-                conn.sendall(f"ERROR: file not found: {rel_file}\n".encode())
-                return
-            text = path.read_text(encoding="utf-8", errors="replace")
-            conn.sendall(text.encode("utf-8"))
+        line = data.partition(b"\n")[0].strip()
+        _log(f"{addr}: {line.decode('utf-8', errors='replace')}")
+
+        if not line:
+            conn.sendall(b"ERROR: empty command\n")
             return
 
-        conn.sendall(b"ERROR: unknown command\n")
+        # One hash lookup on the verb; handlers decode only their arguments
+        verb, _, rest = line.partition(b" ")
+        handler = _COMMANDS.get(verb)
+        if handler is None:
+            conn.sendall(b"ERROR: unknown command. Use: ping, list <dir>, listgz <dir>, read <path>, "
+                         b"readrange <path> <offset> <length>, readtext <path>, "
+                         b"readtext-sanitize <path>\n")
+            return
+        handler(conn, rest)
 
     except socket.timeout:
-        pass
+        _log(f"Client {addr} timed out")
     except Exception as e:
+        _log(f"Error handling {addr}: {e}")
         try:
             conn.sendall(f"ERROR: {e}\n".encode())
         except Exception:
@@ -91,25 +370,40 @@ def _handle_client(conn, addr):
         conn.close()
 
 
-def _accept_loop(server: socket.socket):
-    while True:
-        try:
-            conn, addr = server.accept()
-        except socket.timeout:
-            continue
-        except OSError:
-            break
-        threading.Thread(target=_handle_client, args=(conn, addr), daemon=True).start()
+def _bind(host: str, port: int, reuse_port: bool = False) -> socket.socket:
+    """Listening socket for the bridge; ``reuse_port`` lets several processes share it."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        # Every worker binds the same port; the kernel spreads connections
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    server.settimeout(1.0)  # accept() wakes up, so Ctrl+C works on Windows
+    server.bind((host, port))
+    server.listen(64)
+    return server
+
+
+def _accept_loop(server: socket.socket, max_workers: int = 8):
+    """Accept until ``server`` is closed, handing connections to a fixed pool."""
+    # A fixed pool instead of a thread per connection; extra clients queue
+    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bridge")
+    try:
+        while True:
+            try:
+                conn, addr = server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            pool.submit(_handle_client, conn, addr)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 def start_bridge(host: str = "0.0.0.0", port: int = 9100) -> socket.socket | None:
     """Start the file bridge TCP server in a daemon thread. Returns the server socket."""
     try:
-        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        server.settimeout(1.0)
-        server.bind((host, port))
-        server.listen(5)
+        server = _bind(host, port)
     except OSError as e:
         print(f"[bridge] Could not start on {host}:{port}: {e}")
         return None
@@ -122,6 +416,7 @@ def start_bridge(host: str = "0.0.0.0", port: int = 9100) -> socket.socket | Non
 
     print(f"[bridge] Serving {PROJECT_ROOT} on {host}:{port} (IP: {local_ip})")
 
+    _start_logger()
     thread = threading.Thread(target=_accept_loop, args=(server,), daemon=True)
     thread.start()
     return server
@@ -23,10 +23,10 @@ from overlay.bridge import start_bridge, PROJECT_ROOT
 # Which regions get live OCR preview, with their OCR parameters
 OCR_CONFIGS = {
     "round_text":  {"scale": 3, "method": "threshold", "threshold_val": 140, "psm": 7},
-    "gold_text":   {"scale": 5, "method": "threshold", "threshold_val": 140, "psm": 8, "whitelist": "0123456789"},
-    "lives_text":  {"scale": 5, "method": "threshold", "threshold_val": 140, "psm": 7, "whitelist": "0123456789"},
+    "gold_text":   {"scale": 3, "method": "threshold", "threshold_val": 140, "psm": 8, "whitelist": "0123456789", "interpolation": "linear"},
+    "lives_text":  {"scale": 3, "method": "threshold", "threshold_val": 140, "psm": 7, "whitelist": "0123456789", "interpolation": "linear"},
     "level_text":  {"scale": 4, "method": "adaptive", "psm": 7},
-    "rerolls_text": {"scale": 5, "method": "threshold", "threshold_val": 140, "psm": 8, "whitelist": "0123456789"},
+    "rerolls_text": {"scale": 3, "method": "threshold", "threshold_val": 140, "psm": 8, "whitelist": "0123456789", "interpolation": "linear"},
     "ionia_trait_text": {"scale": 4, "method": "adaptive", "psm": 7},
     "dmg_amount":   {"scale": 5, "method": "threshold", "threshold_val": 140, "psm": 8, "whitelist": "0123456789"},
     "augment_name_0": {"scale": 3, "method": "adaptive", "psm": 7},
@@ -279,6 +279,7 @@ class _OcrWorker(QThread):
                 threshold_val=self._config.get("threshold_val", 140),
                 psm=self._config.get("psm", 7),
                 whitelist=self._config.get("whitelist", ""),
+                interpolation=self._config.get("interpolation", "cubic"),
             )
             self.finished.emit(text)
         except Exception as e:
@@ -338,7 +339,7 @@ class CompanionWindow(QWidget):
             self._augment_scores = engine.get_augment_scores()
         except Exception:
             pass
-        self._champ_names: list[str] = _load_champion_names()
+        self._champ_names: tuple[str, ...] = _load_champion_names()
         self._region_overlay = RegionOverlay()
         self._bridge_server = start_bridge()
         self._ocr_debounce = QTimer()
@@ -851,6 +852,10 @@ class CompanionWindow(QWidget):
 
     def contextMenuEvent(self, event):
         """Right-click to scan the picked augment from the game screen."""
+        self._perform_right_click_scan()
+
+    def _perform_right_click_scan(self):
+        """Read the selected augment from the last frame and record it as picked."""
         if self._reader is None or self._last_frame is None:
             return
         name = self._reader.read_selected_augment(self._last_frame)
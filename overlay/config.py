@@ -90,6 +90,16 @@ class TFTLayout:
                 ))
         return regions
 
+    @property
+    def board_area(self) -> ScreenRegion:
+        """Bounding box of all board hex cells."""
+        regions = self.board_hex_regions
+        x0 = min(r.x for r in regions)
+        y0 = min(r.y for r in regions)
+        x1 = max(r.x + r.w for r in regions)
+        y1 = max(r.y + r.h for r in regions)
+        return ScreenRegion(x0, y0, x1 - x0, y1 - y0)
+
     @classmethod
     def from_calibration(cls, path: Path | None = None) -> "TFTLayout":
         """Load layout from calibration.json, falling back to hardcoded defaults."""
@@ -129,7 +129,7 @@ def vision_loop(capture, reader, engine, overlay, companion, stop_event):
                 prev_round = current_round
 
             # Note: Elimination detection (lives reaching 0) is not currently
-            # implemented because _read_lives() returns None on failure and
+            # implemented because _parse_lives() returns None on failure and
             # only validates values 1-3. Eliminated runs will be closed as
             # "abandoned" via the finally block when the overlay is restarted.
 
@@ -40,6 +40,9 @@ def ensure_stats_tables(conn: sqlite3.Connection) -> None:
             conn.execute(f"ALTER TABLE run_rounds ADD COLUMN {col} {coltype}")
         except sqlite3.OperationalError:
             pass  # column already exists
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS run_rounds_run_idx ON run_rounds(run_id, id)"
+    )
     conn.commit()
 
 
@@ -1,5 +1,9 @@
 import json
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -10,6 +14,9 @@ from overlay.stats import ensure_stats_tables
 
 _STRATEGY_FILE = Path(__file__).parent.parent / "docs" / "strategy.md"
 
+_ASK_CACHE_TTL = 60.0   # seconds an ask_claude answer is reused for
+_ASK_CACHE_SIZE = 128
+
 
 def _load_strategy() -> str:
     try:
@@ -42,7 +49,16 @@ class StrategyEngine:
     def __init__(self, db_path: str | Path):
         self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        if str(db_path) != ":memory:":
+            # WAL lets the AI threads read while StatsRecorder commits rounds
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA mmap_size=268435456")
         ensure_stats_tables(self.conn)
+        # (system, state, question, history) -> (expires_at, reply), LRU order
+        self._claude_cache: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._claude_cache_lock = threading.Lock()
 
     def component_score(self, num_components: int, rounds_remaining: int) -> int:
         return num_components * 2500 * rounds_remaining
@@ -183,13 +199,29 @@ class StrategyEngine:
         }
 
     def ask_claude(self, game_state_summary: str, question: str,
-               history: list[dict] | None = None) -> str:
-        """Ask Claude for complex strategy advice. Returns advice text."""
-        client = Anthropic()
-
+               history: list[dict] | None = None,
+               on_token: Callable[[str], None] | None = None) -> str:
+        """Ask Claude for complex strategy advice. Returns advice text.
+
+        With ``on_token`` the reply is streamed and each text chunk is passed
+        to it as it arrives. Identical requests within ``_ASK_CACHE_TTL``
+        seconds reuse the previous reply instead of calling the API again.
+        """
         system = _STRATEGY or (
             "You are a TFT Tocker's Trials score optimizer. Be concise."
         )
+        key = (system, game_state_summary, question,
+               tuple((m["role"], m["content"]) for m in history or ()))
+        now = time.monotonic()
+        with self._claude_cache_lock:
+            hit = self._claude_cache.get(key)
+            if hit is not None and hit[0] > now:
+                self._claude_cache.move_to_end(key)
+                if on_token is not None:
+                    on_token(hit[1])
+                return hit[1]
+
+        client = Anthropic()
 
         new_message = {
             "role": "user",
@@ -197,15 +229,32 @@ class StrategyEngine:
         }
         messages = list(history or []) + [new_message]
 
-        response = client.messages.create(
-            model=CLAUDE_MODEL,
-            max_tokens=600,
-            system=system,
-            messages=messages,
-        )
-        text = response.content[0].text
-        if response.stop_reason == "max_tokens":
+        # Mark the static strategy prompt cacheable so repeat questions skip
+        # re-processing it on the API side
+        request = dict(model=CLAUDE_MODEL, max_tokens=600, messages=messages,
+                       system=[{"type": "text", "text": system,
+                                "cache_control": {"type": "ephemeral"}}])
+        if on_token is None:
+            response = client.messages.create(**request)
+            text = response.content[0].text
+            stop_reason = response.stop_reason
+        else:
+            chunks = []
+            with client.messages.stream(**request) as stream:
+                for chunk in stream.text_stream:
+                    on_token(chunk)
+                    chunks.append(chunk)
+                stop_reason = stream.get_final_message().stop_reason
+            text = "".join(chunks)
+        if stop_reason == "max_tokens":
             text += " [response truncated]"
+            if on_token is not None:
+                on_token(" [response truncated]")
+        with self._claude_cache_lock:
+            self._claude_cache[key] = (now + _ASK_CACHE_TTL, text)
+            self._claude_cache.move_to_end(key)
+            if len(self._claude_cache) > _ASK_CACHE_SIZE:
+                self._claude_cache.popitem(last=False)
         return text
 
     def update_strategy(self) -> None:
@@ -221,6 +270,16 @@ class StrategyEngine:
         if not runs:
             return
 
+        run_ids = [run["id"] for run in runs]
+        rounds_by_run: dict[int, list[sqlite3.Row]] = {}
+        for r in self.conn.execute(f"""
+            SELECT run_id, round_number, gold, level, lives,
+                   component_count, items_built, life_lost
+            FROM run_rounds WHERE run_id IN ({",".join("?" * len(run_ids))})
+            ORDER BY run_id, id
+        """, run_ids):
+            rounds_by_run.setdefault(r["run_id"], []).append(r)
+
         lines = ["# Run History Summary\n"]
         for run in runs:
             lines.append(
@@ -235,12 +294,7 @@ class StrategyEngine:
                 "|-------|------|-------|-------|------------|"
                 "-------------|-----------|"
             )
-            rounds = self.conn.execute("""
-                SELECT round_number, gold, level, lives,
-                       component_count, items_built, life_lost
-                FROM run_rounds WHERE run_id = ? ORDER BY id
-            """, (run["id"],)).fetchall()
-            for r in rounds:
+            for r in rounds_by_run.get(run["id"], ()):
                 lines.append(
                     f"| {r['round_number']} | {r['gold']} | {r['level']} "
                     f"| {r['lives']} | {r['component_count']} "
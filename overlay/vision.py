@@ -4,21 +4,33 @@ import shutil
 import sqlite3
 import subprocess
 import sys
+import threading
 import time
+from collections.abc import Iterator
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from difflib import SequenceMatcher, get_close_matches
+from functools import lru_cache
 from pathlib import Path
 
 import cv2
 import numpy as np
+from rapidfuzz import fuzz, process
 
 # Resolve tesseract binary once at import
 if sys.platform == "win32":
     _win_tesseract = Path(r"C:\Program Files\Tesseract-OCR\tesseract.exe")
     _tesseract_cmd = str(_win_tesseract) if _win_tesseract.exists() else "tesseract"
+    _tessdata_dir = _win_tesseract.parent / "tessdata"
 else:
     _tesseract_cmd = shutil.which("tesseract") or "tesseract"
+    _tessdata_dir = None
+
+# Optional in-process binding: keeps the LSTM model loaded between calls
+# instead of spawning a tesseract process per crop.
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
 
 log = logging.getLogger(__name__)
 
@@ -37,12 +49,103 @@ class Match:
     stars: int = 0  # 0=unknown, 1/2/3=detected star level
 
 
+def _zero_mean(planes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-channel mean-removed ``(N, C, H, W)`` planes and their L2 norms."""
+    planes = planes - planes.mean(axis=(2, 3), keepdims=True)
+    return planes, np.sqrt((planes ** 2).sum(axis=(1, 2, 3)))
+
+
+# Below this many templates per call, per-template cv2.matchTemplate beats the
+# batched FFT: the tile transforms only pay off once shared by a large stack.
+_FFT_MIN_TEMPLATES = 8
+
+# Most float32 scores held at once by one correlation chunk (16 MB); larger
+# template stacks are correlated and thresholded a chunk at a time
+_SCORE_BUDGET = 1 << 22
+
+# Mean gray levels outside [_EMPTY_LEVEL, _SATURATED_LEVEL] mark a region of
+# interest as blank (empty slot, fog) or washed out, not worth matching
+_EMPTY_LEVEL = 15
+_SATURATED_LEVEL = 245
+
+# Raw template hits before suppression: one record per above-threshold position
+_HIT_DTYPE = np.dtype([("name_id", "i4"), ("x", "i4"), ("y", "i4"), ("c", "f8")])
+
+
+@dataclass
+class _TemplateBucket:
+    """Same-shaped templates stacked for batched correlation.
+
+    Correlation runs on luminance; the colour planes are kept to verify the
+    (few) luminance hits, since icons that differ only in hue look alike in gray.
+    """
+    names: list[str]
+    stack: np.ndarray        # (N, H, W, C) uint8 BGR, contiguous
+    gray: np.ndarray         # (N, H, W) float32 luminance, for cv2.matchTemplate
+    zero_mean: np.ndarray    # (N, 1, H, W) float gray, mean removed
+    norms: np.ndarray        # (N,) L2 norm of zero_mean
+    color_zero_mean: np.ndarray  # (N, C, H, W) float32, per-channel mean removed
+    color_norms: np.ndarray      # (N,) L2 norm of color_zero_mean
+    all_idx: np.ndarray      # (N,) every template index, reused for unfiltered calls
+    name_ids: np.ndarray     # (N,) index of each template in the matcher's name table
+    spectra: dict[tuple[int, int], np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_images(cls, names: list[str], images: list[np.ndarray],
+                    name_ids: np.ndarray) -> "_TemplateBucket":
+        stack = np.ascontiguousarray(np.stack(images))
+        gray = np.stack([cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) for img in images])
+        zero_mean, norms = _zero_mean(gray[:, None].astype(np.float64))
+        color_zero_mean, color_norms = _zero_mean(
+            stack.transpose(0, 3, 1, 2).astype(np.float32))
+        return cls(names, stack, gray.astype(np.float32), zero_mean, norms,
+                   color_zero_mean, color_norms, np.arange(len(names)), name_ids)
+
+    def spectrum(self, fft_shape: tuple[int, int]) -> np.ndarray:
+        """Conjugate template spectra padded to ``fft_shape``, cached per shape."""
+        spec = self.spectra.get(fft_shape)
+        if spec is None:
+            spec = np.conj(np.fft.rfft2(self.zero_mean, s=fft_shape)).astype(np.complex64)
+            self.spectra[fft_shape] = spec
+        return spec
+
+
 class TemplateMatcher:
     def __init__(self, templates_dir: Path, icon_size: int | None = None):
-        self.templates: dict[str, np.ndarray] = {}
-        self._load_templates(templates_dir, icon_size)
-
-    def _load_templates(self, templates_dir: Path, icon_size: int | None):
+        self._templates_dir = templates_dir
+        self._icon_size = icon_size
+        self._templates: dict[str, np.ndarray] | None = None
+        self._load_lock = threading.Lock()
+        self._buckets: list[_TemplateBucket] = []
+        self._all_names: tuple[str, ...] = ()
+        # name -> (bucket index, index within bucket)
+        self._locations: dict[str, tuple[int, int]] = {}
+
+    @property
+    def templates(self) -> dict[str, np.ndarray]:
+        """Template images by name, read from disk on first access."""
+        if self._templates is None:
+            with self._load_lock:
+                if self._templates is None:
+                    self.templates = self._load_templates(self._templates_dir,
+                                                          self._icon_size)
+        return self._templates
+
+    @templates.setter
+    def templates(self, templates: dict[str, np.ndarray]):
+        self._build_buckets(templates)
+        # Expose views into the contiguous bucket stacks rather than keeping
+        # the separately allocated images alive alongside them
+        views = {}
+        for name in self._all_names:
+            b, i = self._locations[name]
+            views[name] = self._buckets[b].stack[i]
+        self._templates = views
+
+    @staticmethod
+    def _load_templates(templates_dir: Path,
+                        icon_size: int | None) -> dict[str, np.ndarray]:
+        templates = {}
         for img_path in templates_dir.glob("*.png"):
             name = img_path.stem
             img = cv2.imread(str(img_path))
@@ -50,54 +153,248 @@ class TemplateMatcher:
                 if icon_size and (img.shape[0] != icon_size or img.shape[1] != icon_size):
                     img = cv2.resize(img, (icon_size, icon_size),
                                      interpolation=cv2.INTER_AREA)
-                self.templates[name] = img
+                templates[name] = img
+        log.debug("loaded %d templates from %s", len(templates), templates_dir)
+        return templates
+
+    def _build_buckets(self, templates: dict[str, np.ndarray]):
+        self._all_names = tuple(templates)
+        by_shape: dict[tuple[int, ...], list[int]] = {}
+        for name_id, name in enumerate(self._all_names):
+            by_shape.setdefault(templates[name].shape, []).append(name_id)
+        self._buckets = []
+        for ids in by_shape.values():
+            names = [self._all_names[i] for i in ids]
+            self._buckets.append(_TemplateBucket.from_images(
+                names, [templates[n] for n in names], np.array(ids, dtype=np.int32)))
+        self._locations = {
+            name: (b, i)
+            for b, bucket in enumerate(self._buckets)
+            for i, name in enumerate(bucket.names)
+        }
+
+    def _selection(self, names: list[str] | None) -> list[tuple[_TemplateBucket, np.ndarray]]:
+        """Buckets to correlate and the template indices wanted from each."""
+        if names is None:
+            return [(bucket, bucket.all_idx) for bucket in self._buckets]
+        picked: dict[int, list[int]] = {}
+        for name in dict.fromkeys(names):
+            loc = self._locations.get(name)
+            if loc is not None:
+                picked.setdefault(loc[0], []).append(loc[1])
+        return [(self._buckets[b], np.array(idx, dtype=np.intp))
+                for b, idx in picked.items()]
 
     def find_matches(
         self,
         scene: np.ndarray,
         threshold: float = 0.8,
         names: list[str] | None = None,
+        rois: list[tuple[int, int, int, int]] | None = None,
     ) -> list[Match]:
-        matches = []
-        search = names or list(self.templates.keys())
-        for name in search:
-            tmpl = self.templates.get(name)
-            if tmpl is None:
-                continue
-            if tmpl.shape[0] > scene.shape[0] or tmpl.shape[1] > scene.shape[1]:
-                continue
-            result = cv2.matchTemplate(scene, tmpl, cv2.TM_CCOEFF_NORMED)
-            locations = np.where(result >= threshold)
-            for y, x in zip(*locations):
-                matches.append(Match(
-                    name=name, x=int(x), y=int(y),
-                    confidence=float(result[y, x]),
-                ))
-        return self._deduplicate(matches)
-
-    def _deduplicate(self, matches: list[Match], distance: int = 10) -> list[Match]:
-        if not matches:
+        """Find template hits in ``scene``.
+
+        ``rois`` optionally limits hits to icons lying wholly inside one of
+        the given ``(x0, y0, x1, y1)`` rectangles. Blank or saturated
+        rectangles are dropped first, and only the remaining ones are
+        correlated, each as its own tile; when none are left no correlation
+        runs at all.
+        """
+        if not self.templates:
+            return []
+        stats = self.scene_stats(scene)
+        if rois is None:
+            tiles = [(0, 0, scene, stats)]
+        else:
+            tiles = [
+                (x0, y0, scene[y0:y1, x0:x1], _slice_stats(stats, x0, y0, x1 - x0, y1 - y0))
+                for x0, y0, x1, y1 in self._live_rois(stats["sums"], rois).tolist()
+            ]
+        chunks = []
+        for bucket, idx in self._selection(names or None):
+            for x0, y0, tile, tile_stats in tiles:
+                for chunk in self._bucket_hits(bucket, idx, tile, tile_stats, threshold):
+                    chunk["x"] += x0
+                    chunk["y"] += y0
+                    chunks.append(chunk)
+        if not chunks:
             return []
-        matches.sort(key=lambda m: -m.confidence)
+        # Suppress on the raw hits; only the survivors become Match objects
+        hits = np.concatenate(chunks)
+        hits = hits[self._nms(hits["x"], hits["y"], hits["c"])]
+        return [
+            Match(name=self._all_names[name_id], x=x, y=y, confidence=c)
+            for name_id, x, y, c in hits.tolist()
+        ]
+
+    def _bucket_hits(self, bucket: _TemplateBucket, idx: np.ndarray, scene: np.ndarray,
+                     stats: dict[str, np.ndarray], threshold: float) -> Iterator[np.ndarray]:
+        """Above-threshold hits of templates ``idx`` in ``scene``, one record array per chunk."""
+        _, th, tw, _ = bucket.stack.shape
+        if th > scene.shape[0] or tw > scene.shape[1]:
+            return
+        for start, results in self._correlate(bucket, idx, stats):
+            part = idx[start:start + len(results)]
+            ks, ys, xs = np.nonzero(results >= threshold)
+            if not len(ks):
+                continue
+            confs = results[ks, ys, xs]
+            if scene.ndim == 3:
+                # Re-score luminance hits in colour and keep that confidence
+                confs = self._color_scores(bucket, part[ks], ys, xs, scene)
+                ok = confs >= threshold
+                ks, ys, xs, confs = ks[ok], ys[ok], xs[ok], confs[ok]
+            chunk = np.empty(len(ks), dtype=_HIT_DTYPE)
+            chunk["name_id"] = bucket.name_ids[part[ks]]
+            chunk["x"], chunk["y"], chunk["c"] = xs, ys, confs
+            yield chunk
+
+    @staticmethod
+    def scene_stats(scene: np.ndarray) -> dict[str, np.ndarray]:
+        """Float luminance plane and integral images of ``scene``."""
+        gray = cv2.cvtColor(scene, cv2.COLOR_BGR2GRAY) if scene.ndim == 3 else scene
+        h, w = gray.shape
+        sums, sqsums = cv2.integral2(gray, sdepth=cv2.CV_64F, sqdepth=cv2.CV_64F)
+        return {
+            "planes": gray[None].astype(np.float32),
+            "sums": sums.reshape(h + 1, w + 1, 1),
+            "sqsums": sqsums.reshape(h + 1, w + 1, 1),
+        }
+
+    @staticmethod
+    def _live_rois(sums: np.ndarray, rois: list[tuple[int, int, int, int]]) -> np.ndarray:
+        """``rois`` clamped to the scene, without the blank or saturated ones."""
+        h, w = sums.shape[0] - 1, sums.shape[1] - 1
+        boxes = np.array(rois, dtype=np.intp).reshape(-1, 4)
+        boxes[:, 0::2] = boxes[:, 0::2].clip(0, w)
+        boxes[:, 1::2] = boxes[:, 1::2].clip(0, h)
+        x0, y0, x1, y1 = boxes.T
+        area = (x1 - x0) * (y1 - y0)
+        total = sums[y1, x1, 0] - sums[y0, x1, 0] - sums[y1, x0, 0] + sums[y0, x0, 0]
+        mean = total / np.maximum(area, 1)
+        keep = (area > 0) & (mean >= _EMPTY_LEVEL) & (mean <= _SATURATED_LEVEL)
+        return boxes[keep]
+
+    @staticmethod
+    def _color_scores(bucket: _TemplateBucket, tmpl: np.ndarray, ys: np.ndarray,
+                      xs: np.ndarray, scene: np.ndarray) -> np.ndarray:
+        """Colour TM_CCOEFF_NORMED of template ``tmpl[i]`` at ``(xs[i], ys[i])``."""
+        _, th, tw, _ = bucket.stack.shape
+        windows = np.lib.stride_tricks.sliding_window_view(
+            scene, (th, tw), axis=(0, 1))[ys, xs].astype(np.float32)
+        windows, window_norms = _zero_mean(windows)
+        numer = np.einsum("nchw,nchw->n", windows, bucket.color_zero_mean[tmpl])
+        denom = window_norms * bucket.color_norms[tmpl]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(denom > 1e-6, numer / denom, 0.0)
+
+    def _correlate(self, bucket: _TemplateBucket, idx: np.ndarray,
+                   stats: dict[str, np.ndarray]) -> Iterator[tuple[int, np.ndarray]]:
+        """TM_CCOEFF_NORMED of the templates in ``idx`` against ``scene``.
+
+        Yields ``(start, scores)`` pairs, where ``scores`` is a float32
+        ``(n, out_h, out_w)`` array for ``idx[start:start + n]``. Chunks hold
+        at most ``_SCORE_BUDGET`` scores, so the full template-by-position
+        volume never exists at once.
+
+        Fewer than ``_FFT_MIN_TEMPLATES`` templates are matched one by one with
+        cv2.matchTemplate. Otherwise the scene is cut into overlapping tiles a
+        few template-widths wide; each tile is transformed once and multiplied
+        against the chunk's stack of template spectra, so the scene is read once
+        per chunk instead of once per template. Window statistics for the
+        normalisation come from integral images.
+        """
+        _, th, tw, _ = bucket.stack.shape
+        planes = stats["planes"]
+        sh, sw = planes.shape[1:]
+        oh, ow = sh - th + 1, sw - tw + 1
+        size = max(1, _SCORE_BUDGET // (oh * ow))
+        if len(idx) < _FFT_MIN_TEMPLATES:
+            for start in range(0, len(idx), size):
+                part = idx[start:start + size]
+                out = np.empty((len(part), oh, ow), dtype=np.float32)
+                for j, k in enumerate(part.tolist()):
+                    out[j] = cv2.matchTemplate(planes[0], bucket.gray[k],
+                                               cv2.TM_CCOEFF_NORMED)
+                yield start, np.clip(out, -1.0, 1.0, out=out)
+            return
+
+        sums, sqsums = stats["sums"], stats["sqsums"]
+
+        def window(integ):
+            return integ[th:, tw:] - integ[:-th, tw:] - integ[th:, :-tw] + integ[:-th, :-tw]
+
+        # The window term of the denominator is shared by every template:
+        # compute its reciprocal once per (out_h, out_w) plane
+        s1, s2 = window(sums), window(sqsums)
+        std = np.sqrt(np.maximum((s2 - s1 * s1 / (th * tw)).sum(axis=2), 0.0))
+        inv_std = np.zeros((oh, ow), dtype=np.float32)
+        np.divide(1.0, std, out=inv_std, where=std > 1e-6, casting="unsafe")
+        norms = bucket.norms[idx]
+        inv_norms = np.zeros(len(idx), dtype=np.float32)
+        np.divide(1.0, norms, out=inv_norms, where=norms > 1e-6, casting="unsafe")
+
+        block_h, block_w = min(sh, 4 * th), min(sw, 4 * tw)
+        fft_shape = (cv2.getOptimalDFTSize(block_h), cv2.getOptimalDFTSize(block_w))
+        step_h, step_w = block_h - th + 1, block_w - tw + 1
+        for start in range(0, len(idx), size):
+            part = idx[start:start + size]
+            spec = bucket.spectrum(fft_shape)[part]
+            scores = np.empty((len(part), oh, ow), dtype=np.float32)
+            for y0 in range(0, oh, step_h):
+                y1 = min(y0 + block_h, sh)
+                for x0 in range(0, ow, step_w):
+                    x1 = min(x0 + block_w, sw)
+                    tile = np.fft.rfft2(planes[:, y0:y1, x0:x1], s=fft_shape)
+                    corr = np.fft.irfft2((spec * tile).sum(axis=1), s=fft_shape)
+                    scores[:, y0:y1 - th + 1, x0:x1 - tw + 1] = \
+                        corr[:, :y1 - th + 1 - y0, :x1 - tw + 1 - x0]
+            scores *= inv_std
+            scores *= inv_norms[start:start + len(part), None, None]
+            yield start, np.clip(scores, -1.0, 1.0, out=scores)
+
+    @staticmethod
+    def _nms(xs: np.ndarray, ys: np.ndarray, confs: np.ndarray,
+             distance: int = 10) -> np.ndarray:
+        """Greedy non-maximum suppression, best confidence first.
+
+        Returns the indices of the kept points in confidence order.
+        Coordinates are hashed into a grid of ``distance``-sized cells, so any
+        kept match within ``distance`` (L∞) of a candidate must sit in one of
+        the 9 cells around it — O(n) expected instead of comparing against
+        every kept match.
+        """
+        order = np.argsort(-confs, kind="stable")
+        oxs = xs[order].tolist()
+        oys = ys[order].tolist()
+        gxs = (xs[order] // distance).tolist()
+        gys = (ys[order] // distance).tolist()
+
+        grid: dict[tuple[int, int], list[int]] = {}
         kept = []
-        for m in matches:
-            if not any(
-                abs(m.x - k.x) < distance and abs(m.y - k.y) < distance
-                for k in kept
+        for i, idx in enumerate(order.tolist()):
+            x, y, gx, gy = oxs[i], oys[i], gxs[i], gys[i]
+            if any(
+                abs(x - oxs[k]) < distance and abs(y - oys[k]) < distance
+                for cell in ((gx + dx, gy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+                for k in grid.get(cell, ())
             ):
-                kept.append(m)
-        return kept
+                continue
+            grid.setdefault((gx, gy), []).append(i)
+            kept.append(idx)
+        return np.array(kept, dtype=np.intp)
 
 
-def _load_champion_names() -> list[str]:
-    """Load all champion names from the database for fuzzy matching."""
+@lru_cache(maxsize=1)
+def _load_champion_names() -> tuple[str, ...]:
+    """Load all champion names from the database for fuzzy matching (cached)."""
     try:
         conn = sqlite3.connect(DB_PATH)
         rows = conn.execute("SELECT name FROM champions").fetchall()
         conn.close()
-        return [r[0].strip() for r in rows]
+        return tuple(r[0].strip() for r in rows)
     except Exception:
-        return []
+        return ()
 
 
 CHAMPION_NAMES = _load_champion_names()
@@ -119,11 +416,36 @@ def _load_augment_names() -> list[str]:
 AUGMENT_NAMES = _load_augment_names()
 
 
-def _ocr_text(image: np.ndarray, scale: int = 4, method: str = "threshold",
-              threshold_val: int = 140, psm: int = 7, whitelist: str = "") -> str:
-    """Run Tesseract OCR on a BGR image via stdin/stdout (no temp files)."""
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-    scaled = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+def _fuzzy_match(text: str, choices, cutoff: float) -> tuple[str, float] | None:
+    """Closest of ``choices`` to ``text`` as ``(choice, ratio)``, or None.
+
+    ``ratio`` is a case-insensitive 0..1 similarity; matches below ``cutoff``
+    are rejected.
+    """
+    hit = process.extractOne(text, choices, scorer=fuzz.ratio,
+                             processor=str.lower, score_cutoff=cutoff * 100)
+    if hit is None:
+        return None
+    return hit[0], hit[1] / 100
+
+
+# Run the preprocessing chain through OpenCL (T-API) when a device is available
+_USE_UMAT = cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
+_INTERPOLATION = {"cubic": cv2.INTER_CUBIC, "linear": cv2.INTER_LINEAR}
+
+
+def _preprocess(image: np.ndarray, scale: int = 4, method: str = "threshold",
+                threshold_val: int = 140, interpolation: str = "cubic") -> np.ndarray:
+    """Grayscale, upscale and binarize a BGR (or already gray) crop for Tesseract.
+
+    With OpenCL the whole chain stays on the device and only the final binary
+    image is downloaded.
+    """
+    src = cv2.UMat(image) if _USE_UMAT else image
+    gray = src if image.ndim == 2 else cv2.cvtColor(src, cv2.COLOR_BGR2GRAY)
+    scaled = cv2.resize(gray, None, fx=scale, fy=scale,
+                        interpolation=_INTERPOLATION[interpolation])
 
     if method == "otsu":
         _, proc = cv2.threshold(scaled, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
@@ -132,23 +454,202 @@ def _ocr_text(image: np.ndarray, scale: int = 4, method: str = "threshold",
                                       cv2.THRESH_BINARY, 31, -10)
     else:
         _, proc = cv2.threshold(scaled, threshold_val, 255, cv2.THRESH_BINARY)
+    return proc.get() if _USE_UMAT else proc
 
-    _, png = cv2.imencode(".png", proc)
+
+_tess_local = threading.local()
+
+
+def _tess_api(psm: int, whitelist: str):
+    """Return this thread's PyTessBaseAPI for ``psm`` (instances aren't thread-safe)."""
+    apis = getattr(_tess_local, "apis", None)
+    if apis is None:
+        apis = _tess_local.apis = {}
+    entry = apis.get(psm)
+    if entry is None:
+        kwargs = {"lang": "eng", "psm": psm}
+        if _tessdata_dir is not None and _tessdata_dir.exists():
+            kwargs["path"] = str(_tessdata_dir)
+        entry = apis[psm] = [tesserocr.PyTessBaseAPI(**kwargs), None]
+    api, current = entry
+    if whitelist != current:
+        api.SetVariable("tessedit_char_whitelist", whitelist)
+        entry[1] = whitelist
+    return api
+
+
+@lru_cache(maxsize=None)
+def _tesseract_args(psm: int, whitelist: str, tsv: bool) -> tuple[str, ...]:
+    """Command line for the tesseract binary, built once per configuration."""
     cmd = [_tesseract_cmd, "stdin", "stdout", "--psm", str(psm)]
     if whitelist:
         cmd += ["-c", f"tessedit_char_whitelist={whitelist}"]
+    if tsv:
+        cmd.append("tsv")
+    return tuple(cmd)
+
+
+def _run_tesseract(proc: np.ndarray, psm: int, whitelist: str = "",
+                   tsv: bool = False) -> str:
+    """OCR a preprocessed grayscale image, in-process when tesserocr is available."""
+    if tesserocr is not None:
+        try:
+            api = _tess_api(psm, whitelist)
+            h, w = proc.shape
+            api.SetImageBytes(np.ascontiguousarray(proc).tobytes(), w, h, 1, w)
+            text = api.GetTSVText(0) if tsv else api.GetUTF8Text()
+            return text.strip()
+        except Exception:
+            log.debug("tesserocr failed, falling back to tesseract binary",
+                      exc_info=True)
+    _, png = cv2.imencode(".png", proc)
     try:
-        result = subprocess.run(cmd, input=png.tobytes(),
+        result = subprocess.run(_tesseract_args(psm, whitelist, tsv),
+                                input=png.tobytes(),
                                 capture_output=True, timeout=10)
         return result.stdout.decode().strip()
     except Exception:
         return ""
 
 
+def _ocr_text(image: np.ndarray, scale: int = 4, method: str = "threshold",
+              threshold_val: int = 140, psm: int = 7, whitelist: str = "",
+              interpolation: str = "cubic") -> str:
+    """Run Tesseract OCR on a BGR image via stdin/stdout (no temp files)."""
+    proc = _preprocess(image, scale, method, threshold_val, interpolation)
+    return _run_tesseract(proc, psm, whitelist)
+
+
+_DIGITS = "0123456789"
+
+
+def _ocr_digits(image: np.ndarray, scale: int = 5, threshold_val: int = 140,
+                psm: int = 8) -> str:
+    """OCR a bright-on-dark number: fixed threshold, digit whitelist."""
+    return _run_tesseract(_preprocess(image, scale, "threshold", threshold_val),
+                          psm, _DIGITS)
+
+
+def _ocr_name(image: np.ndarray, scale: int = 3, method: str = "adaptive",
+              psm: int = 7) -> str:
+    """OCR a name label (champion, augment, trait) without a whitelist."""
+    return _run_tesseract(_preprocess(image, scale, method), psm)
+
+
+class _OcrBatch:
+    """Stack several small crops into one montage and OCR them in one Tesseract run.
+
+    Each crop is preprocessed on its own, padded to a common width and separated
+    by blank rows so Tesseract sees one text line per crop. Words are dispatched
+    back to their crop by vertical position. Whitelists are not applied — callers
+    filter the text per field.
+    """
+
+    _GAP = 20  # blank rows between crops
+
+    def __init__(self):
+        self._items: list[tuple[str, np.ndarray]] = []
+
+    def add(self, name: str, image: np.ndarray, scale: int = 4,
+            method: str = "threshold", threshold_val: int = 140,
+            interpolation: str = "cubic") -> None:
+        self._items.append((name, _preprocess(image, scale, method, threshold_val,
+                                              interpolation)))
+
+    def run(self, psm: int = 6) -> dict[str, str]:
+        if not self._items:
+            return {}
+        width = max(img.shape[1] for _, img in self._items)
+        rows = []
+        spans = []  # (name, top, bottom) in montage coordinates
+        y = self._GAP
+        rows.append(np.zeros((self._GAP, width), dtype=np.uint8))
+        for name, img in self._items:
+            h, w = img.shape
+            rows.append(cv2.copyMakeBorder(img, 0, self._GAP, 0, width - w,
+                                           cv2.BORDER_CONSTANT, value=0))
+            spans.append((name, y, y + h))
+            y += h + self._GAP
+        montage = np.vstack(rows)
+
+        words: dict[str, list[str]] = {name: [] for name, _, _ in spans}
+        tsv = _run_tesseract(montage, psm, tsv=True)
+        for line in tsv.splitlines():
+            cols = line.split("\t")
+            if len(cols) < 12 or cols[0] != "5" or not cols[11].strip():
+                continue
+            center = int(cols[7]) + int(cols[9]) // 2
+            for name, top, bottom in spans:
+                if top <= center < bottom:
+                    words[name].append(cols[11].strip())
+                    break
+        return {name: " ".join(w) for name, w in words.items()}
+
+
+_RE_ROUND = re.compile(r"(\d+\s*-\s*\d+)")
+_RE_NON_DIGIT = re.compile(r"\D")
+_RE_DIGIT_RUN = re.compile(r"\d+")
+_RE_WORDS = re.compile(r"[a-zA-Z]+")
+_RE_CLEAN_NAME = re.compile(r"[^a-zA-Z\s']")
+
+
+# HSV colour classes as (label, lower, upper) inclusive boxes; labels start at 1
+_PIP_CLASSES = (
+    (1, (20, 100, 150), (40, 255, 255)),   # gold pips
+    (2, (0, 0, 180), (180, 60, 255)),      # silver pips (grayish-white)
+)
+_DAMAGE_CLASSES = (
+    (1, (0, 80, 80), (10, 255, 255)),      # red (physical), low hue
+    (1, (170, 80, 80), (180, 255, 255)),   # red (physical), high hue
+    (2, (100, 80, 80), (130, 255, 255)),   # blue (magic)
+    (3, (0, 0, 200), (180, 40, 255)),      # white (true)
+)
+
+
+def _hsv_class_counts(image: np.ndarray, classes) -> np.ndarray:
+    """Pixel counts per class label for a BGR ``image``.
+
+    Returns an array indexed by label (index 0 counts unclassified pixels).
+    Classes must not overlap.
+    """
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    counts = np.zeros(max(label for label, _, _ in classes) + 1, dtype=np.int64)
+    for label, lo, hi in classes:
+        counts[label] += cv2.countNonZero(cv2.inRange(hsv, lo, hi))
+    counts[0] = hsv.shape[0] * hsv.shape[1] - counts[1:].sum()
+    return counts
+
+
 def _crop(frame: np.ndarray, region: ScreenRegion) -> np.ndarray:
     return frame[region.y:region.y + region.h, region.x:region.x + region.w]
 
 
+def _region_mean(integ: np.ndarray, region: ScreenRegion) -> float:
+    """Mean of ``region`` from a single-channel integral image, clamped to bounds."""
+    h, w = integ.shape[0] - 1, integ.shape[1] - 1
+    x0, y0 = min(max(region.x, 0), w), min(max(region.y, 0), h)
+    x1, y1 = min(region.x + region.w, w), min(region.y + region.h, h)
+    area = (x1 - x0) * (y1 - y0)
+    if area <= 0:
+        return 0.0
+    total = integ[y1, x1] - integ[y0, x1] - integ[y1, x0] + integ[y0, x0]
+    return float(total) / area
+
+
+def _slice_stats(stats: dict[str, np.ndarray], x: int, y: int,
+                 w: int, h: int) -> dict[str, np.ndarray]:
+    """View of ``TemplateMatcher.scene_stats`` output for a sub-rectangle.
+
+    Window sums are corner differences, so a slice of a larger integral image
+    serves the sub-rectangle without recomputing it.
+    """
+    return {
+        "planes": stats["planes"][:, y:y + h, x:x + w],
+        "sums": stats["sums"][y:y + h + 1, x:x + w + 1],
+        "sqsums": stats["sqsums"][y:y + h + 1, x:x + w + 1],
+    }
+
+
 @dataclass
 class DamageBreakdown:
     physical_pct: float = 0.0  # red pixels
@@ -187,6 +688,11 @@ class GameStateReader:
         self.augment_matcher = augment_matcher
         self.ionia_locked = False
         self._pool = ThreadPoolExecutor(max_workers=6)
+        # Shop cards get their own workers: _read_shop_names itself runs on
+        # self._pool, so nesting the cards there would compete for its slots.
+        # Each worker thread keeps its own tesserocr API (see _tess_api).
+        self._shop_pool = ThreadPoolExecutor(max_workers=5,
+                                             thread_name_prefix="shop-ocr")
         # Cached OCR results (only re-read on round change)
         self._last_round: str | None = None
         self._cached_gold: int | None = None
@@ -209,16 +715,11 @@ class GameStateReader:
             log.debug("round change: %s → %s", self._last_round, round_number)
             self._last_round = round_number
             t0 = time.perf_counter()
-            f_gold = self._pool.submit(self._read_gold, frame)
-            f_lives = self._pool.submit(self._read_lives, frame)
-            f_level = self._pool.submit(self._read_level, frame)
-            f_rerolls = self._pool.submit(self._read_rerolls, frame)
+            f_status = self._pool.submit(self._read_status_text, frame)
             f_shop = self._pool.submit(self._read_shop_names, frame)
             f_damage = self._pool.submit(self._read_top_damage, frame)
-            self._cached_gold = f_gold.result()
-            self._cached_lives = f_lives.result()
-            self._cached_level = f_level.result()
-            self._cached_rerolls = f_rerolls.result()
+            (self._cached_gold, self._cached_lives,
+             self._cached_level, self._cached_rerolls) = f_status.result()
             self._cached_shop = f_shop.result()
             self._cached_damage = f_damage.result()
             log.debug("parallel OCR done in %.0fms — gold=%s lives=%s lvl=%s rerolls=%s shop=%s",
@@ -266,27 +767,43 @@ class GameStateReader:
         crop = _crop(frame, self.layout.round_text)
         text = _ocr_text(crop, scale=3, method="threshold",
                          threshold_val=140, psm=7)
-        m = re.search(r"(\d+\s*-\s*\d+)", text)
+        m = _RE_ROUND.search(text)
         if m:
             return m.group(1).replace(" ", "")
         return None
 
-    def _read_gold(self, frame: np.ndarray) -> int | None:
-        crop = _crop(frame, self.layout.gold_text)
-        text = _ocr_text(crop, scale=5, method="threshold",
-                         threshold_val=140, psm=8,
-                         whitelist="0123456789")
-        digits = re.sub(r"\D", "", text)
+    def _read_status_text(self, frame: np.ndarray) -> tuple[int | None, ...]:
+        """OCR gold, lives, level and rerolls in a single batched Tesseract run."""
+        batch = _OcrBatch()
+        batch.add("gold", _crop(frame, self.layout.gold_text),
+                  scale=3, method="threshold", threshold_val=140,
+                  interpolation="linear")
+        batch.add("lives", _crop(frame, self.layout.lives_text),
+                  scale=3, method="threshold", threshold_val=140,
+                  interpolation="linear")
+        batch.add("level", _crop(frame, self.layout.level_text),
+                  scale=4, method="adaptive")
+        batch.add("rerolls", _crop(frame, self.layout.rerolls_text),
+                  scale=3, method="threshold", threshold_val=140,
+                  interpolation="linear")
+        texts = batch.run()
+        return (
+            self._parse_gold(texts["gold"]),
+            self._parse_lives(texts["lives"]),
+            self._parse_level(texts["level"]),
+            self._parse_rerolls(texts["rerolls"]),
+        )
+
+    @staticmethod
+    def _parse_gold(text: str) -> int | None:
+        digits = _RE_NON_DIGIT.sub("", text)
         result = int(digits) if digits else None
         log.debug("ocr gold: raw=%r → %s", text, result)
         return result
 
-    def _read_lives(self, frame: np.ndarray) -> int | None:
-        crop = _crop(frame, self.layout.lives_text)
-        text = _ocr_text(crop, scale=5, method="threshold",
-                         threshold_val=140, psm=7,
-                         whitelist="0123456789")
-        digits = re.sub(r"\D", "", text)
+    @staticmethod
+    def _parse_lives(text: str) -> int | None:
+        digits = _RE_NON_DIGIT.sub("", text)
         result = None
         if digits:
             val = int(digits[0])
@@ -295,10 +812,9 @@ class GameStateReader:
         log.debug("ocr lives: raw=%r → %s", text, result)
         return result
 
-    def _read_level(self, frame: np.ndarray) -> int | None:
-        crop = _crop(frame, self.layout.level_text)
-        text = _ocr_text(crop, scale=4, method="adaptive", psm=7)
-        digits = re.findall(r"\d+", text)
+    @staticmethod
+    def _parse_level(text: str) -> int | None:
+        digits = _RE_DIGIT_RUN.findall(text)
         result = None
         if digits:
             val = int(digits[-1])
@@ -307,12 +823,9 @@ class GameStateReader:
         log.debug("ocr level: raw=%r → %s", text, result)
         return result
 
-    def _read_rerolls(self, frame: np.ndarray) -> int | None:
-        crop = _crop(frame, self.layout.rerolls_text)
-        text = _ocr_text(crop, scale=5, method="threshold",
-                         threshold_val=140, psm=8,
-                         whitelist="0123456789")
-        digits = re.sub(r"\D", "", text)
+    @staticmethod
+    def _parse_rerolls(text: str) -> int | None:
+        digits = _RE_NON_DIGIT.sub("", text)
         result = None
         if digits:
             val = int(digits)
@@ -335,18 +848,15 @@ class GameStateReader:
         crop = _crop(frame, self.layout.ionia_trait_text)
         if np.mean(crop) < 10:
             return None
-        text = _ocr_text(crop, scale=4, method="adaptive", psm=7)
+        text = _ocr_name(crop, scale=4, method="adaptive", psm=7)
         if not text:
             return None
         # Extract keyword from "Path of the <Name>:" or "Path of <Name>:"
-        from difflib import get_close_matches
-        words = re.findall(r"[a-zA-Z]+", text)
+        words = _RE_WORDS.findall(text)
         for word in words:
-            matches = get_close_matches(
-                word, list(self.IONIA_PATH_MAP.keys()), n=1, cutoff=0.6
-            )
-            if matches:
-                return self.IONIA_PATH_MAP[matches[0]]
+            hit = _fuzzy_match(word, list(self.IONIA_PATH_MAP), 0.6)
+            if hit:
+                return self.IONIA_PATH_MAP[hit[0]]
         return None
 
     def read_selected_augment(self, frame: np.ndarray) -> str | None:
@@ -354,12 +864,12 @@ class GameStateReader:
         crop = _crop(frame, self.layout.selected_augment_text)
         if np.mean(crop) < 15:
             return None
-        text = _ocr_text(crop, scale=3, method="adaptive", psm=7)
+        text = _ocr_name(crop, scale=3, method="adaptive", psm=7)
         clean = text.strip()
         if not clean:
             return None
-        matches = get_close_matches(clean, AUGMENT_NAMES, n=1, cutoff=0.6)
-        return matches[0] if matches else None
+        hit = _fuzzy_match(clean, AUGMENT_NAMES, 0.6)
+        return hit[0] if hit else None
 
     def _read_augment_names(self, frame: np.ndarray) -> list[str]:
         """OCR the 3 augment card names, fuzzy matched against known augments."""
@@ -377,20 +887,20 @@ class GameStateReader:
         crop = _crop(frame, region)
         if np.mean(crop) < 15:
             return None
-        text = _ocr_text(crop, scale=3, method="adaptive", psm=7)
+        text = _ocr_name(crop, scale=3, method="adaptive", psm=7)
         clean = text.strip()
         if not clean:
             return None
-        matches = get_close_matches(clean, AUGMENT_NAMES, n=1, cutoff=0.6)
-        result = matches[0] if matches else None
+        hit = _fuzzy_match(clean, AUGMENT_NAMES, 0.6)
+        result = hit[0] if hit else None
         log.debug("ocr augment: raw=%r → %s", clean, result)
         return result
 
     def _read_shop_names(self, frame: np.ndarray) -> list[str]:
         """Read champion names from 5 shop card slots using multi-pass OCR."""
-        futures = [self._pool.submit(self._read_single_card, frame, r)
-                   for r in self.layout.shop_card_names]
-        return [f.result() or "" for f in futures]
+        names = self._shop_pool.map(lambda r: self._read_single_card(frame, r),
+                                    self.layout.shop_card_names)
+        return [name or "" for name in names]
 
     def _read_single_card(self, frame: np.ndarray, region: ScreenRegion) -> str | None:
         """Read a single shop card name with adaptive + OTSU fallback."""
@@ -401,16 +911,16 @@ class GameStateReader:
         ocr_texts = []
 
         # Method 1: adaptive threshold, scale 4, PSM 11 (best for Illaoi-type names)
-        text1 = _ocr_text(crop, scale=4, method="adaptive", psm=11)
+        text1 = _ocr_name(crop, scale=4, method="adaptive", psm=11)
         first_line = text1.split("\n")[0].strip()
-        clean1 = re.sub(r"[^a-zA-Z\s']", "", first_line).strip()
+        clean1 = _RE_CLEAN_NAME.sub("", first_line).strip()
         if clean1:
             ocr_texts.append(clean1)
 
         # Method 2: OTSU threshold, scale 3, PSM 11 (best for Kog'Maw-type names)
-        text2 = _ocr_text(crop, scale=3, method="otsu", psm=11)
+        text2 = _ocr_name(crop, scale=3, method="otsu", psm=11)
         first_line2 = text2.split("\n")[0].strip()
-        clean2 = re.sub(r"[^a-zA-Z\s']", "", first_line2).strip()
+        clean2 = _RE_CLEAN_NAME.sub("", first_line2).strip()
         if clean2:
             ocr_texts.append(clean2)
 
@@ -418,12 +928,9 @@ class GameStateReader:
         best_match = None
         best_ratio = 0
         for ocr in ocr_texts:
-            matches = get_close_matches(ocr, CHAMPION_NAMES, n=1, cutoff=0.3)
-            if matches:
-                ratio = SequenceMatcher(None, ocr.lower(), matches[0].lower()).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_match = matches[0]
+            hit = _fuzzy_match(ocr, CHAMPION_NAMES, 0.3)
+            if hit and hit[1] > best_ratio:
+                best_match, best_ratio = hit
 
         log.debug("ocr shop card: adaptive=%r otsu=%r → %s", clean1, clean2, best_match)
         return best_match
@@ -445,23 +952,34 @@ class GameStateReader:
         return result
 
     def _detect_board_champions(self, frame: np.ndarray) -> list[Match]:
-        """Detect champions on the board by scanning each hex cell."""
+        """Detect champions on the board, keeping the best match per hex cell.
+
+        Luminance statistics are taken once over the board area, and only the
+        occupied hex cells are correlated, each as its own tile. Each hit is
+        assigned to the hex cell that fully contains its icon.
+        """
+        board = self.layout.board_area
+        cells = np.array([r.bbox for r in self.layout.board_hex_regions])  # (x0, y0, x1, y1)
+        # Empty cells are skipped inside find_matches, which correlates only the
+        # occupied cells
+        matches = self.champion_matcher.find_matches(
+            _crop(frame, board), threshold=BOARD_MATCH_THRESHOLD,
+            rois=(cells - (board.x, board.y, board.x, board.y)).tolist(),
+        )
+        best: dict[int, Match] = {}
+        for m in matches:
+            th, tw = self.champion_matcher.templates[m.name].shape[:2]
+            x, y = m.x + board.x, m.y + board.y
+            inside = np.nonzero((cells[:, 0] <= x) & (cells[:, 1] <= y)
+                                & (x + tw <= cells[:, 2]) & (y + th <= cells[:, 3]))[0]
+            for cell in inside.tolist():
+                if cell not in best or m.confidence > best[cell].confidence:
+                    best[cell] = Match(m.name, x, y, m.confidence)
         results = []
-        for region in self.layout.board_hex_regions:
-            cell_crop = _crop(frame, region)
-            # Skip empty cells
-            gray = cv2.cvtColor(cell_crop, cv2.COLOR_BGR2GRAY)
-            if np.mean(gray) < 15:
-                continue
-            matches = self.champion_matcher.find_matches(
-                cell_crop, threshold=BOARD_MATCH_THRESHOLD,
-            )
-            if matches:
-                best = max(matches, key=lambda m: m.confidence)
-                best.x += region.x
-                best.y += region.y
-                best.stars = self._detect_stars(frame, best)
-                results.append(best)
+        for cell in sorted(best):
+            match = best[cell]
+            match.stars = self._detect_stars(frame, match)
+            results.append(match)
         return results
 
     def _detect_stars(self, frame: np.ndarray, match: Match) -> int:
@@ -487,15 +1005,7 @@ class GameStateReader:
             return 0
 
         pip_crop = frame[pip_y:pip_y + pip_h, pip_x:pip_x + pip_w]
-        hsv = cv2.cvtColor(pip_crop, cv2.COLOR_BGR2HSV)
-
-        # Gold pips: H 20-40, S > 100, V > 150
-        gold_mask = cv2.inRange(hsv, (20, 100, 150), (40, 255, 255))
-        gold_pixels = cv2.countNonZero(gold_mask)
-
-        # Silver pips: S < 60, V > 180 (grayish-white)
-        silver_mask = cv2.inRange(hsv, (0, 0, 180), (180, 60, 255))
-        silver_pixels = cv2.countNonZero(silver_mask)
+        _, gold_pixels, silver_pixels = _hsv_class_counts(pip_crop, _PIP_CLASSES)
 
         total_pip_pixels = gold_pixels + silver_pixels
         if gold_pixels > 50:
@@ -511,19 +1021,8 @@ class GameStateReader:
         bar_crop = _crop(frame, self.layout.dmg_bar)
         if np.mean(bar_crop) < 10:
             return None  # bar not visible
-
-        hsv = cv2.cvtColor(bar_crop, cv2.COLOR_BGR2HSV)
-
-        # Red (physical): H 0-10 or 170-180, S > 80, V > 80
-        red_lo = cv2.inRange(hsv, (0, 80, 80), (10, 255, 255))
-        red_hi = cv2.inRange(hsv, (170, 80, 80), (180, 255, 255))
-        red_px = cv2.countNonZero(red_lo) + cv2.countNonZero(red_hi)
-
-        # Blue (magic): H 100-130, S > 80, V > 80
-        blue_px = cv2.countNonZero(cv2.inRange(hsv, (100, 80, 80), (130, 255, 255)))
-
-        # White (true): S < 40, V > 200
-        white_px = cv2.countNonZero(cv2.inRange(hsv, (0, 0, 200), (180, 40, 255)))
+        _, red_px, blue_px, white_px = (
+            int(n) for n in _hsv_class_counts(bar_crop, _DAMAGE_CLASSES))
 
         total = red_px + blue_px + white_px
         if total == 0:
@@ -545,11 +1044,7 @@ class GameStateReader:
 
         # Read stars from dmg_stars region (gold/silver pip counting)
         stars_crop = _crop(frame, self.layout.dmg_stars)
-        hsv_stars = cv2.cvtColor(stars_crop, cv2.COLOR_BGR2HSV)
-        gold_mask = cv2.inRange(hsv_stars, (20, 100, 150), (40, 255, 255))
-        gold_px = cv2.countNonZero(gold_mask)
-        silver_mask = cv2.inRange(hsv_stars, (0, 0, 180), (180, 60, 255))
-        silver_px = cv2.countNonZero(silver_mask)
+        _, gold_px, silver_px = _hsv_class_counts(stars_crop, _PIP_CLASSES)
         pip_total = gold_px + silver_px
         if gold_px > 50:
             dmg.stars = 3
@@ -560,10 +1055,8 @@ class GameStateReader:
 
         # OCR the damage number
         amt_crop = _crop(frame, self.layout.dmg_amount)
-        amt_text = _ocr_text(amt_crop, scale=5, method="threshold",
-                             threshold_val=140, psm=8,
-                             whitelist="0123456789")
-        digits = re.sub(r"\D", "", amt_text)
+        amt_text = _ocr_digits(amt_crop, scale=5, threshold_val=140, psm=8)
+        digits = _RE_NON_DIGIT.sub("", amt_text)
         if digits:
             dmg.amount = int(digits)
 
@@ -0,0 +1,72 @@
+import shutil
+
+import numpy as np
+import pytest
+from PyQt6.QtWidgets import QApplication
+from overlay.strategy import StrategyEngine
+
+
+@pytest.fixture(scope="session")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope="session")
+def engine(tmp_path_factory):
+    """StrategyEngine over a copy of tft.db, opened once per test process.
+
+    The copy keeps WAL sidecar files and schema upgrades out of the repo.
+    """
+    db = tmp_path_factory.mktemp("db") / "tft.db"
+    shutil.copyfile("tft.db", db)
+    return StrategyEngine(db)
+
+
+class _EngineStub:
+    """Minimal StrategyEngine stand-in for CompanionWindow tests."""
+
+    def __init__(self, scores=None, reply=""):
+        self.ask_claude = lambda *a, **k: reply
+        self.get_augment_scores = lambda *a, **k: scores or {}
+
+
+@pytest.fixture(scope="session")
+def make_engine():
+    """Factory for engine stubs: ``make_engine(scores={...}, reply="...")``."""
+    return _EngineStub
+
+
+@pytest.fixture(scope="session")
+def engine_stub(make_engine):
+    """Shared engine stub with no augment scores and an empty AI reply."""
+    return make_engine()
+
+
+# Blank frames shared by every test; read-only so no test can dirty them
+_FRAME_1440P = np.zeros((1440, 2560, 3), dtype=np.uint8)
+_FRAME_1440P.setflags(write=False)
+_FRAME_4K = np.zeros((2160, 3840, 3), dtype=np.uint8)
+_FRAME_4K.setflags(write=False)
+_FRAME_SMALL = np.zeros((100, 100, 3), dtype=np.uint8)
+_FRAME_SMALL.setflags(write=False)
+
+
+@pytest.fixture(scope="session")
+def frame_1440p():
+    return _FRAME_1440P
+
+
+@pytest.fixture(scope="session")
+def frame_4k():
+    return _FRAME_4K
+
+
+@pytest.fixture(scope="session")
+def small_frame():
+    return _FRAME_SMALL
+
+
+@pytest.fixture
+def frame(request):
+    """The frame fixture named by an indirect ``frame`` parametrization."""
+    return request.getfixturevalue(request.param)
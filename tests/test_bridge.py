@@ -0,0 +1,185 @@
+import gzip
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import overlay.bridge as bridge
+import tools.file_bridge as file_bridge
+
+
+def _ask(port: int, command: bytes) -> bytes:
+    """Send one command line to the bridge on ``port``; return the raw reply."""
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(command + b"\n")
+        reply = b""
+        while chunk := sock.recv(65536):
+            reply += chunk
+    return reply
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    """Bridge serving a throwaway project root with a sibling-prefix neighbour."""
+    project = tmp_path / "root"
+    (project / "crops").mkdir(parents=True)
+    (project / "crops" / "a.png").write_bytes(b"\x89PNG" + bytes(range(256)) * 300)
+    (project / "notes.txt").write_bytes("héllo\n".encode())
+    (tmp_path / "root_evil").mkdir()
+    (tmp_path / "root_evil" / "secret.txt").write_text("nope")
+    monkeypatch.setattr(bridge, "PROJECT_ROOT", project)
+    return project
+
+
+@pytest.fixture
+def request_bridge(root):
+    """Send one command to a live bridge on an ephemeral port; return the raw reply."""
+    server = bridge.start_bridge("127.0.0.1", 0)
+    port = server.getsockname()[1]
+    yield lambda command: _ask(port, command)
+    server.close()
+
+
+@pytest.mark.parametrize("rel", ["../root_evil/secret.txt", "/etc/passwd", "crops/../../root_evil"])
+def test_safe_path_rejects_escapes(root, rel):
+    assert bridge._safe_path(rel) is None
+
+
+def test_safe_path_resolves_inside_root(root):
+    assert bridge._safe_path("crops/../notes.txt") == root / "notes.txt"
+    assert bridge._safe_path(".") == root
+
+
+def test_list_and_read_round_trip(root, request_bridge):
+    assert request_bridge(b"list crops") == b"a.png\n"
+    data = (root / "crops" / "a.png").read_bytes()
+    assert request_bridge(b"read crops/a.png") == f"SIZE {len(data)}\n".encode() + data
+    assert request_bridge(b"readtext notes.txt") == (root / "notes.txt").read_bytes()
+    assert request_bridge(b"read ../root_evil/secret.txt").startswith(b"ERROR")
+
+
+def test_safe_path_rejects_symlink_out_of_root(root, tmp_path):
+    (root / "link").symlink_to(tmp_path / "root_evil")
+    assert bridge._safe_path("link/secret.txt") is None
+
+
+def test_safe_path_sees_directory_swapped_for_symlink(root, tmp_path, request_bridge):
+    (root / "d").mkdir()
+    (root / "d" / "s.txt").write_text("inside")
+    assert bridge._safe_path("d/s.txt") == root / "d" / "s.txt"
+    (root / "d" / "s.txt").unlink()
+    (root / "d").rmdir()
+    (tmp_path / "root_evil" / "s.txt").write_text("secret")
+    (root / "d").symlink_to(tmp_path / "root_evil")
+    assert bridge._safe_path("d/s.txt") is None
+    assert request_bridge(b"read d/s.txt").startswith(b"ERROR")
+
+
+def test_read_serves_fresh_bytes_after_file_changes(root, request_bridge):
+    crop = root / "crops" / "slot.png"
+    crop.write_bytes(b"first")
+    assert request_bridge(b"read crops/slot.png") == b"SIZE 5\nfirst"
+    assert request_bridge(b"read crops/slot.png") == b"SIZE 5\nfirst"
+    crop.write_bytes(b"second!")
+    assert request_bridge(b"read crops/slot.png") == b"SIZE 7\nsecond!"
+
+
+def test_read_sizes_reply_from_bytes_actually_read(root, request_bridge, monkeypatch):
+    # The file grew between stat() and read(): 5 bytes on stat, 7 served
+    monkeypatch.setattr(bridge, "_small_file", lambda path, st: b"second!")
+    (root / "crops" / "slot.png").write_bytes(b"first")
+    assert request_bridge(b"read crops/slot.png") == b"SIZE 7\nsecond!"
+    assert request_bridge(b"readrange crops/slot.png 4 3") == b"SIZE 3\nnd!"
+    monkeypatch.setattr(bridge, "_small_file", lambda path, st: b"ab")
+    reply = request_bridge(b"readrange crops/slot.png 1 3")
+    assert reply == b"ERROR: range outside file of 2 bytes\n"
+
+
+def test_readtext_sanitize_replaces_invalid_utf8(root, request_bridge):
+    (root / "bad.txt").write_bytes(b"ok \xff\xfe caf\xc3\xa9")
+    assert request_bridge(b"readtext bad.txt") == b"ok \xff\xfe caf\xc3\xa9"
+    assert request_bridge(b"readtext-sanitize bad.txt") == "ok �� café".encode()
+    (root / "good.txt").write_bytes("café ✓\n".encode())
+    assert request_bridge(b"readtext-sanitize good.txt") == "café ✓\n".encode()
+    # Past the small-file cache: streamed, with a sequence split across chunks
+    big = b"a" * (bridge._FILE_CACHE_MAX + bridge._CHUNK - 1) + "é".encode() + b"\xff"
+    (root / "big.txt").write_bytes(big)
+    assert request_bridge(b"readtext-sanitize big.txt") == big[:-1] + "�".encode()
+
+
+def test_listgz_is_gzipped_list(root, request_bridge):
+    (root / "crops" / "b.png").write_bytes(b"b")
+    header, _, packed = request_bridge(b"listgz crops").partition(b"\n")
+    assert header == f"GZIP {len(packed)}".encode()
+    assert gzip.decompress(packed) == request_bridge(b"list crops") == b"a.png\nb.png\n"
+
+
+@pytest.mark.parametrize("sendfile", [True, False], ids=["sendfile", "send-loop"])
+def test_large_read_with_and_without_os_sendfile(root, request_bridge, monkeypatch, sendfile):
+    if not sendfile:
+        monkeypatch.delattr(bridge.os, "sendfile", raising=False)
+    data = bytes(range(256)) * 2000
+    (root / "crops" / "big.png").write_bytes(data)
+    assert request_bridge(b"read crops/big.png") == f"SIZE {len(data)}\n".encode() + data
+    reply = request_bridge(b"readrange crops/big.png 70000 300000")
+    assert reply == b"SIZE 300000\n" + data[70000:370000]
+
+
+@pytest.mark.parametrize("name, size", [("small.bin", 1000), ("large.bin", 400_000)])
+def test_readrange_returns_requested_slice(root, request_bridge, name, size):
+    data = bytes(range(256)) * (size // 256 + 1)
+    (root / "crops" / name).write_bytes(data[:size])
+    for offset, length in ((0, 8), (size - 100, 100), (3, size - 3)):
+        reply = request_bridge(f"readrange crops/{name} {offset} {length}".encode())
+        assert reply == f"SIZE {length}\n".encode() + data[offset:offset + length]
+    assert request_bridge(f"readrange crops/{name} {size - 1} 2".encode()).startswith(b"ERROR")
+    assert request_bridge(f"readrange crops/{name} 0".encode()).startswith(b"ERROR: usage")
+
+
+def test_file_bridge_serves_shared_handlers(root):
+    server = bridge._bind("127.0.0.1", 0)
+    port = server.getsockname()[1]
+    thread = threading.Thread(target=file_bridge._serve, args=(server,), daemon=True)
+    thread.start()
+    assert _ask(port, b"ping") == b"pong\n"
+    assert _ask(port, b"list crops") == b"a.png\n"
+    assert _ask(port, b"bogus").startswith(b"ERROR: unknown command. Use:")
+    server.close()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_file_bridge_rejects_zero_workers():
+    with pytest.raises(SystemExit):
+        file_bridge.main(["--workers", "0"])
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="needs SO_REUSEPORT")
+def test_file_bridge_workers_share_one_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    script = Path(file_bridge.__file__)
+    proc = subprocess.Popen(
+        [sys.executable, str(script), "--host", "127.0.0.1", "--port", str(port), "--workers", "3"],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    try:
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                assert _ask(port, b"ping") == b"pong\n"
+                break
+            except ConnectionRefusedError:
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+        for _ in range(20):
+            assert b"bridge.py\n" in _ask(port, b"list overlay")
+    finally:
+        proc.send_signal(signal.SIGINT)
+        out, _ = proc.communicate(timeout=10)
+    assert proc.returncode == 0
+    assert b"Workers: 3" in out
@@ -1,36 +1,71 @@
 import pytest
-import numpy as np
-from unittest.mock import MagicMock
-from PyQt6.QtWidgets import QApplication
-from overlay.companion import CompanionWindow
+from PyQt6.QtCore import QPoint
+from PyQt6.QtGui import QContextMenuEvent
+from PyQt6.QtWidgets import QApplication, QLineEdit, QPushButton, QTextEdit
+from overlay.companion import CompanionWindow, ScoreBreakdownBar, _AiWorker
+from overlay.vision import GameState
 
 
-@pytest.fixture(scope="module")
-def app():
-    return QApplication.instance() or QApplication([])
+class _ReaderStub:
+    """GameStateReader stand-in whose augment scan always reads ``name``."""
+
+    def __init__(self, name):
+        self.read_selected_augment = lambda frame: name
+
 
+@pytest.fixture(autouse=True)
+def _sync_ai(monkeypatch):
+    """Run AI requests inline instead of on a QThread.
 
-def _make_engine(**scores):
-    engine = MagicMock()
-    engine.get_augment_scores.return_value = scores
-    return engine
+    The worker still emits through its queued connection, so the response
+    only lands once the test processes events — "thinking..." stays visible
+    until then.
+    """
+    monkeypatch.setattr(_AiWorker, "start", lambda self: self.run())
 
 
-def test_companion_window_has_panels(app):
-    window = CompanionWindow(engine=_make_engine())
+@pytest.fixture(scope="module")
+def _shared_window(app, engine_stub):
+    return CompanionWindow(engine=engine_stub)
+
+
+@pytest.fixture
+def window(_shared_window):
+    """Module-wide CompanionWindow, with per-game and chat state reset after each test."""
+    w = _shared_window
+    yield w
+    if w._worker is not None:
+        QApplication.processEvents()  # deliver its queued response before reset
+        w._worker = None
+    w._history.clear()
+    w._current_game_state_text = ""
+    w._picked_augments.clear()
+    w._all_seen_augments.clear()
+    w._current_augment_round = None
+    w._current_choices = []
+    w._input_field.clear()
+    w._chat_display.clear()
+    w._last_frame = None
+    w._reader = None
+
+
+@pytest.fixture
+def window_with_engine(app):
+    """Factory for a fresh CompanionWindow around a specific engine."""
+    return lambda engine: CompanionWindow(engine=engine)
+
+
+def test_companion_window_has_panels(window):
     assert window.game_info_panel is not None
     assert window.chat_panel is not None
     assert window.input_bar is not None
 
 
-def test_companion_window_title(app):
-    window = CompanionWindow(engine=_make_engine())
+def test_companion_window_title(window):
     assert "Tocker" in window.windowTitle()
 
 
-def test_companion_internals(app):
-    from PyQt6.QtWidgets import QTextEdit, QLineEdit, QPushButton
-    window = CompanionWindow(engine=_make_engine())
+def test_companion_internals(window):
     assert isinstance(window._chat_display, QTextEdit)
     assert window._chat_display.isReadOnly()
     assert isinstance(window._input_field, QLineEdit)
@@ -39,9 +74,7 @@ def test_companion_internals(app):
     assert window._current_game_state_text == ""
 
 
-def test_game_info_updates(app):
-    from overlay.vision import GameState
-    window = CompanionWindow(engine=_make_engine())
+def test_game_info_updates(window):
     state = GameState(
         phase="planning",
         round_number="2-5",
@@ -52,53 +85,45 @@ def test_game_info_updates(app):
         items_on_bench=[],
     )
     window.update_game_state(state, projected_score=142300)
-    # Score displayed in dedicated widget
-    assert "142,300" in window._score_value.text()
-    # Round displayed as absolute
-    assert "15" in window._round_value.text()
-    # Gold displayed
-    assert "8" in window._gold_value.text()
+    score, round_, gold = (label.text() for label in (
+        window._score_value, window._round_value, window._gold_value))
+    assert "142,300" in score  # score displayed in dedicated widget
+    assert "15" in round_      # round displayed as absolute
+    assert "8" in gold
 
 
-def test_chat_appends_user_message(app):
-    window = CompanionWindow(engine=_make_engine())
+def test_chat_appends_user_message(window):
     window._input_field.setText("Should I level?")
     window._on_send()
     assert "Should I level?" in window._chat_display.toPlainText()
 
 
-def test_chat_clears_input_on_send(app):
-    window = CompanionWindow(engine=_make_engine())
+def test_chat_clears_input_on_send(window):
     window._input_field.setText("Should I level?")
     window._on_send()
     assert window._input_field.text() == ""
 
 
-def test_chat_shows_thinking_indicator(app):
-    window = CompanionWindow(engine=_make_engine())
+def test_chat_shows_thinking_indicator(window):
     window._input_field.setText("Any advice?")
     window._on_send()
     assert "thinking" in window._chat_display.toPlainText().lower()
 
 
-def test_chat_replaces_thinking_with_response(app):
-    engine = _make_engine()
-    engine.ask_claude.return_value = "Hold your components."
-    window = CompanionWindow(engine=engine)
+def test_chat_replaces_thinking_with_response(window_with_engine, make_engine):
+    window = window_with_engine(make_engine(reply="Hold your components."))
     window._input_field.setText("Should I build?")
     window._on_send()
-    # Simulate worker finishing synchronously
-    window._on_ai_response("Hold your components.", "Should I build?")
+    QApplication.processEvents()
     text = window._chat_display.toPlainText()
     assert "Hold your components." in text
     assert "thinking" not in text.lower()
 
 
-def test_augment_recommendations_update(app):
+def test_augment_recommendations_update(window_with_engine, make_engine):
     """When augment choices arrive on augment round, recommendations should appear."""
-    from overlay.vision import GameState
-    scores = {"Augment A": 85, "Augment B": 72, "Augment C": 41}
-    window = CompanionWindow(engine=_make_engine(**scores))
+    window = window_with_engine(
+        make_engine({"Augment A": 85, "Augment B": 72, "Augment C": 41}))
     state = GameState(
         round_number="1-5",
         augment_choices=["Augment A", "Augment B", "Augment C"],
@@ -112,11 +137,9 @@ def test_augment_recommendations_update(app):
     assert "85" in rec_text
 
 
-def test_augment_recommendations_sorted_by_score(app):
+def test_augment_recommendations_sorted_by_score(window_with_engine, make_engine):
     """Augments should be sorted by score descending."""
-    from overlay.vision import GameState
-    scores = {"Low": 10, "High": 90, "Mid": 50}
-    window = CompanionWindow(engine=_make_engine(**scores))
+    window = window_with_engine(make_engine({"Low": 10, "High": 90, "Mid": 50}))
     state = GameState(
         round_number="2-5",
         augment_choices=["Low", "Mid", "High"],
@@ -131,31 +154,22 @@ def test_augment_recommendations_sorted_by_score(app):
     assert high_pos < mid_pos < low_pos
 
 
-def test_right_click_scan_records_augment(app):
+def test_right_click_scan_records_augment(window, small_frame):
     """Right-click scan should record detected augment."""
-    from overlay.vision import GameState
-    window = CompanionWindow(engine=_make_engine())
-
-    # Set up a mock reader
-    mock_reader = MagicMock()
-    mock_reader.read_selected_augment.return_value = "Bandle Bounty I"
-    window._reader = mock_reader
-    window._last_frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    # Set up a stub reader
+    window._reader = _ReaderStub("Bandle Bounty I")
+    window._last_frame = small_frame
 
-    # Simulate right-click via contextMenuEvent
-    from PyQt6.QtGui import QContextMenuEvent
-    from PyQt6.QtCore import QPoint
-    event = QContextMenuEvent(QContextMenuEvent.Reason.Mouse, QPoint(10, 10))
-    window.contextMenuEvent(event)
+    # A real right-click event, so the contextMenuEvent hook stays covered
+    QApplication.sendEvent(window, QContextMenuEvent(QContextMenuEvent.Reason.Mouse,
+                                                     QPoint(10, 10)))
 
     assert "Bandle Bounty I" in window._picked_augments
 
 
-def test_right_click_scan_gold_destiny(app):
+def test_right_click_scan_gold_destiny(window_with_engine, small_frame, make_engine):
     """Scanned augment can differ from offered choices (Gold Destiny case)."""
-    from overlay.vision import GameState
-    scores = {"A": 50, "B": 60, "C": 70}
-    window = CompanionWindow(engine=_make_engine(**scores))
+    window = window_with_engine(make_engine({"A": 50, "B": 60, "C": 70}))
 
     state = GameState(
         round_number="1-5",
@@ -165,112 +179,70 @@ def test_right_click_scan_gold_destiny(app):
     window.update_game_state(state)
 
     # Scan returns a name NOT in offered choices
-    mock_reader = MagicMock()
-    mock_reader.read_selected_augment.return_value = "Random Augment Z"
-    window._reader = mock_reader
-    window._last_frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    window._reader = _ReaderStub("Random Augment Z")
+    window._last_frame = small_frame
 
-    from PyQt6.QtGui import QContextMenuEvent
-    from PyQt6.QtCore import QPoint
-    event = QContextMenuEvent(QContextMenuEvent.Reason.Mouse, QPoint(10, 10))
-    window.contextMenuEvent(event)
+    window._perform_right_click_scan()
 
     # Should still record it
     assert "Random Augment Z" in window._picked_augments
 
 
-def test_new_game_resets_augment_state(app):
-    """Round 1-1 should reset all augment state."""
-    from overlay.vision import GameState
-    window = CompanionWindow(engine=_make_engine())
-
-    state = GameState(
-        round_number="1-5",
-        augment_choices=["X", "Y", "Z"],
-        items_on_bench=[],
-    )
-    window.update_game_state(state)
-    assert window._current_choices == ["X", "Y", "Z"]
-
-    # Simulate picking via right-click
-    mock_reader = MagicMock()
-    mock_reader.read_selected_augment.return_value = "X"
-    window._reader = mock_reader
-    window._last_frame = np.zeros((100, 100, 3), dtype=np.uint8)
-    from PyQt6.QtGui import QContextMenuEvent
-    from PyQt6.QtCore import QPoint
-    event = QContextMenuEvent(QContextMenuEvent.Reason.Mouse, QPoint(10, 10))
-    window.contextMenuEvent(event)
-    assert len(window._picked_augments) == 1
-
-    # New game
-    state2 = GameState(round_number="1-1", items_on_bench=[])
-    window.update_game_state(state2)
-    assert window._picked_augments == []
-    assert window._all_seen_augments == set()
-    assert window._current_augment_round is None
-    assert window._current_choices == []
-
-
-def test_non_augment_round_ignored(app):
-    """Augment choices on non-augment rounds should be ignored."""
-    from overlay.vision import GameState
-    window = CompanionWindow(engine=_make_engine())
-
-    state = GameState(
-        round_number="1-5",
-        augment_choices=["A", "B", "C"],
-        items_on_bench=[],
-    )
-    window.update_game_state(state)
-    assert window._current_choices == ["A", "B", "C"]
-
-    # Non-augment round with garbage should not update choices
-    state2 = GameState(
-        round_number="1-6",
-        augment_choices=["Garbage"],
-        items_on_bench=[],
-    )
-    window.update_game_state(state2)
+@pytest.fixture(scope="module")
+def aug_state_1_5():
+    return GameState(round_number="1-5", augment_choices=["A", "B", "C"],
+                     items_on_bench=[])
+
+
+@pytest.mark.parametrize("follow_up, choices, seen, picked, augment_round", [
+    # Augment choices on non-augment rounds should be ignored
+    pytest.param(GameState(round_number="1-6", augment_choices=["Garbage"],
+                           items_on_bench=[]),
+                 ["A", "B", "C"], {"A", "B", "C"}, ["A"], "1-5",
+                 id="non-augment-round-ignored"),
+    # Each augment round (1-5, 2-5, 3-5) should reset seen augments
+    pytest.param(GameState(round_number="2-5", augment_choices=["D", "E", "F"],
+                           items_on_bench=[]),
+                 ["D", "E", "F"], {"D", "E", "F"}, ["A"], "2-5",
+                 id="next-augment-round-resets-seen"),
+    # Round 1-1 should reset all augment state
+    pytest.param(GameState(round_number="1-1", items_on_bench=[]),
+                 [], set(), [], None,
+                 id="new-game-resets-everything"),
+])
+def test_augment_state_after_next_round(window, small_frame, aug_state_1_5,
+                                        follow_up, choices, seen, picked,
+                                        augment_round):
+    window.update_game_state(aug_state_1_5)
     assert window._current_choices == ["A", "B", "C"]
+    assert window._all_seen_augments == {"A", "B", "C"}
 
+    # Simulate picking via right-click
+    window._reader = _ReaderStub("A")
+    window._last_frame = small_frame
+    window._perform_right_click_scan()
+    assert window._picked_augments == ["A"]
 
-def test_augment_round_reset(app):
-    """Each augment round (1-5, 2-5, 3-5) should reset seen augments."""
-    from overlay.vision import GameState
-    window = CompanionWindow(engine=_make_engine())
-
-    state = GameState(
-        round_number="1-5",
-        augment_choices=["A", "B", "C"],
-        items_on_bench=[],
-    )
-    window.update_game_state(state)
-    assert len(window._all_seen_augments) == 3
-
-    # New augment round should reset seen
-    state2 = GameState(
-        round_number="2-5",
-        augment_choices=["D", "E", "F"],
-        items_on_bench=[],
-    )
-    window.update_game_state(state2)
-    assert window._all_seen_augments == {"D", "E", "F"}
-    assert window._current_choices == ["D", "E", "F"]
+    window.update_game_state(follow_up)
+    assert window._current_choices == choices
+    assert window._all_seen_augments == seen
+    assert window._picked_augments == picked
+    assert window._current_augment_round == augment_round
 
 
-def test_collapsible_sections_exist(app):
+def test_collapsible_sections_exist(window):
     """Verify collapsible sections are present."""
-    window = CompanionWindow(engine=_make_engine())
     assert window._board_section is not None
     assert window._shop_section is not None
     assert window._cal_section is not None
     assert window._chat_section is not None
 
 
+_SEGMENTS = ((100, "#FF0000"), (200, "#00FF00"), (50, "#0000FF"))
+
+
 def test_score_breakdown_bar(app):
     """Verify ScoreBreakdownBar accepts segments."""
-    from overlay.companion import ScoreBreakdownBar
     bar = ScoreBreakdownBar()
-    bar.set_segments([(100, "#FF0000"), (200, "#00FF00"), (50, "#0000FF")])
+    bar.set_segments(_SEGMENTS)
     assert len(bar._segments) == 3
@@ -1,18 +1,45 @@
+import cv2
 import numpy as np
+import pytest
 from overlay.vision import GameStateReader, GameState, TemplateMatcher
 from overlay.config import TFTLayout
 
+_EMPTY_MATCHER = TemplateMatcher.__new__(TemplateMatcher)
+_EMPTY_MATCHER.templates = {}
 
-def test_read_returns_game_state():
-    layout = TFTLayout()
-    empty = TemplateMatcher.__new__(TemplateMatcher)
-    empty.templates = {}
 
-    reader = GameStateReader(layout, item_matcher=empty)
-    frame = np.zeros((1440, 2560, 3), dtype=np.uint8)
+@pytest.mark.parametrize("frame", ["frame_1440p", "frame_4k"], ids=["1440p", "4k"],
+                         indirect=True)
+def test_read_returns_game_state(frame):
+    reader = GameStateReader(TFTLayout(), item_matcher=_EMPTY_MATCHER)
     state = reader.read(frame)
 
     assert isinstance(state, GameState)
     assert state.phase == "planning"
     assert state.items_on_bench == []
     assert state.shop == []  # no round detected, shop not scanned yet
+
+
+def test_board_champions_assigned_to_hex_cells(tmp_path, frame_1440p):
+    icon = np.zeros((60, 60, 3), dtype=np.uint8)
+    icon[:30, :30] = icon[30:, 30:] = (0, 0, 255)
+    templates_dir = tmp_path / "champions"
+    templates_dir.mkdir()
+    cv2.imwrite(str(templates_dir / "TFT16_TestChamp.png"), icon)
+
+    layout = TFTLayout()
+    reader = GameStateReader(layout, champion_matcher=TemplateMatcher(templates_dir))
+    frame = frame_1440p.copy()
+    cells = layout.board_hex_regions
+    for i, (dx, dy) in ((0, (20, 10)), (9, (100, 40))):
+        r = cells[i]
+        frame[r.y:r.y + r.h, r.x:r.x + r.w] = 60
+        frame[r.y + dy:r.y + dy + 60, r.x + dx:r.x + dx + 60] = icon
+
+    found = reader._detect_board_champions(frame)
+
+    assert [(m.name, m.x, m.y) for m in found] == [
+        ("TFT16_TestChamp", cells[0].x + 20, cells[0].y + 10),
+        ("TFT16_TestChamp", cells[9].x + 100, cells[9].y + 40),
+    ]
+
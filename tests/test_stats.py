@@ -3,12 +3,27 @@ import pytest
 from overlay.stats import ensure_stats_tables, StatsRecorder
 
 
-@pytest.fixture
-def conn():
+@pytest.fixture(scope="module")
+def _db():
     c = sqlite3.connect(":memory:")
     c.row_factory = sqlite3.Row
     ensure_stats_tables(c)
-    return c
+    yield c
+    c.close()
+
+
+def _reset(conn):
+    conn.execute("DELETE FROM run_rounds")
+    conn.execute("DELETE FROM runs")
+    conn.execute("DELETE FROM sqlite_sequence")
+    conn.commit()
+
+
+@pytest.fixture
+def conn(_db):
+    """Module-wide stats database, emptied after each test."""
+    yield _db
+    _reset(_db)
 
 
 def test_ensure_creates_tables(conn):
@@ -1,12 +1,3 @@
-import pytest
-from overlay.strategy import StrategyEngine
-
-
-@pytest.fixture
-def engine():
-    return StrategyEngine("tft.db")
-
-
 def test_score_from_components(engine):
     score = engine.component_score(num_components=5, rounds_remaining=20)
     assert score == 250_000
@@ -53,3 +44,7 @@ def test_projected_score(engine):
     # 2750 * 30 = 82500
     assert result["time_pts"] == 82_500
     assert result["total"] == 592_500
+
+
+def test_file_database_uses_wal(engine):
+    assert engine.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
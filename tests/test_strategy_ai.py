@@ -17,7 +17,8 @@ def test_ask_claude_sends_correct_prompt():
 
     assert result == "Save your components."
     call_kwargs = mock_client.messages.create.call_args.kwargs
-    assert "2,500" in call_kwargs["system"]
+    assert "2,500" in call_kwargs["system"][0]["text"]
+    assert call_kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
     assert "Round 10" in call_kwargs["messages"][0]["content"]
 
 
@@ -47,6 +48,40 @@ def test_ask_claude_with_history():
     assert "What about now?" in messages[2]["content"]
 
 
+def test_ask_claude_reuses_identical_request():
+    engine = StrategyEngine(":memory:")
+    mock_client = MagicMock()
+    mock_response = MagicMock()
+    mock_response.content = [MagicMock(text="Level now.")]
+    mock_response.stop_reason = "end_turn"
+    mock_client.messages.create.return_value = mock_response
+
+    with patch("overlay.strategy.Anthropic", return_value=mock_client):
+        first = engine.ask_claude("Round 10, 5 components", "Should I level?")
+        second = engine.ask_claude("Round 10, 5 components", "Should I level?")
+        assert mock_client.messages.create.call_count == 1
+        engine.ask_claude("Round 11, 5 components", "Should I level?")
+
+    assert first == second == "Level now."
+    assert mock_client.messages.create.call_count == 2
+
+
+def test_ask_claude_streams_tokens_to_callback():
+    engine = StrategyEngine(":memory:")
+    mock_client = MagicMock()
+    stream = mock_client.messages.stream.return_value.__enter__.return_value
+    stream.text_stream = ["Hold ", "your ", "components."]
+    stream.get_final_message.return_value.stop_reason = "end_turn"
+    tokens = []
+
+    with patch("overlay.strategy.Anthropic", return_value=mock_client):
+        result = engine.ask_claude("Round 10", "Should I build?", on_token=tokens.append)
+
+    assert result == "Hold your components."
+    assert tokens == ["Hold ", "your ", "components."]
+    assert not mock_client.messages.create.called
+
+
 def _make_engine_with_runs():
     """Create an in-memory engine with two completed runs."""
     engine = StrategyEngine(":memory:")
@@ -1,7 +1,18 @@
+import subprocess
+
 import numpy as np
 import cv2
 import pytest
-from overlay.vision import TemplateMatcher
+import overlay.vision as vision
+from overlay.config import ScreenRegion
+from overlay.vision import (
+    TemplateMatcher,
+    _DAMAGE_CLASSES,
+    _fuzzy_match,
+    _hsv_class_counts,
+    _preprocess,
+    _region_mean,
+)
 
 
 def _make_checkerboard(size, color_a, color_b):
@@ -39,6 +50,22 @@ def test_loads_templates(matcher):
     assert "TFT16_TestChamp" in matcher.templates
 
 
+def test_templates_are_views_into_bucket_stack(matcher):
+    assert len(matcher.templates) == 2
+    bucket = matcher._buckets[0]
+    for name in bucket.names:
+        assert np.shares_memory(matcher.templates[name], bucket.stack)
+
+
+def test_templates_load_on_first_access(tmp_path):
+    templates_dir = tmp_path / "champions"
+    templates_dir.mkdir()
+    matcher = TemplateMatcher(templates_dir)
+    cv2.imwrite(str(templates_dir / "TFT16_Late.png"),
+                _make_checkerboard(20, [0, 0, 255], [0, 0, 0]))
+    assert list(matcher.templates) == ["TFT16_Late"]
+
+
 def test_finds_match_in_image(matcher):
     scene = np.zeros((100, 100, 3), dtype=np.uint8)
     # Embed the red checkerboard pattern at position (50, 30)
@@ -52,9 +79,174 @@ def test_finds_match_in_image(matcher):
     assert abs(matches[0].y - 30) <= 2
 
 
+def test_find_matches_restricted_to_names(matcher):
+    scene = np.zeros((100, 100, 3), dtype=np.uint8)
+    scene[30:50, 50:70] = _make_checkerboard(20, [0, 0, 255], [0, 0, 0])
+
+    assert matcher.find_matches(scene, threshold=0.95, names=["TFT16_OtherChamp"]) == []
+    hits = matcher.find_matches(scene, threshold=0.95,
+                                names=["TFT16_TestChamp", "Unknown"])
+    assert [m.name for m in hits] == ["TFT16_TestChamp"]
+
+
+def test_find_matches_limited_to_live_rois(matcher):
+    scene = np.zeros((100, 100, 3), dtype=np.uint8)
+    scene[30:50, 50:70] = _make_checkerboard(20, [0, 0, 255], [0, 0, 0])
+
+    hits = matcher.find_matches(scene, threshold=0.95, rois=[(0, 0, 40, 40), (45, 25, 75, 55)])
+    assert [(m.name, m.x, m.y) for m in hits] == [("TFT16_TestChamp", 50, 30)]
+    # Icon not wholly inside the rectangle
+    assert matcher.find_matches(scene, threshold=0.95, rois=[(55, 25, 75, 55)]) == []
+    # Blank rectangles short-circuit before any correlation
+    matcher._correlate = None
+    assert matcher.find_matches(scene, threshold=0.95, rois=[(0, 0, 40, 40)]) == []
+
+
 def test_no_false_positives(matcher):
     scene = np.zeros((100, 100, 3), dtype=np.uint8)
     scene[:, :, 1] = 255  # All green — no match for red or blue patterns
 
     matches = matcher.find_matches(scene, threshold=0.95)
     assert len(matches) == 0
+
+
+def test_nms_keeps_best_per_neighbourhood():
+    xs, ys, confs = (np.array(col) for col in zip(
+        (50, 30, 0.90),
+        (52, 31, 0.97),   # suppresses its neighbours
+        (58, 38, 0.95),   # within 10px of the best in both axes
+        (63, 30, 0.93),   # 11px away in x — kept
+        (9, 9, 0.85),     # crosses a grid-cell boundary from (0, 0)
+        (0, 0, 0.80),
+    ))
+    keep = TemplateMatcher._nms(xs, ys, confs)
+    assert [(xs[i], ys[i]) for i in keep] == [(52, 31), (63, 30), (9, 9)]
+
+
+def test_ocr_batch_dispatches_words_by_row(monkeypatch):
+    seen = {}
+
+    def fake_tesseract(proc, psm, whitelist="", tsv=False):
+        seen["shape"] = proc.shape
+        header = "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext"
+        # gold crop occupies rows 20..70, level crop rows 90..190
+        return "\n".join([
+            header,
+            "5\t1\t1\t1\t1\t1\t4\t30\t40\t30\t95\t12",
+            "5\t1\t1\t1\t2\t1\t4\t120\t60\t40\t90\tLvl.",
+            "5\t1\t1\t1\t2\t2\t70\t120\t30\t40\t90\t7",
+        ])
+
+    monkeypatch.setattr(vision, "_run_tesseract", fake_tesseract)
+    batch = vision._OcrBatch()
+    batch.add("gold", np.zeros((10, 20, 3), dtype=np.uint8), scale=5)
+    batch.add("level", np.zeros((25, 30, 3), dtype=np.uint8), scale=4)
+    texts = batch.run()
+
+    assert texts == {"gold": "12", "level": "Lvl. 7"}
+    assert seen["shape"] == (20 + 50 + 20 + 100 + 20, 120)
+
+
+def test_run_tesseract_falls_back_to_binary_without_tesserocr(monkeypatch):
+    calls = []
+
+    def fake_run(cmd, input, capture_output, timeout):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout=b" 42 \n")
+
+    monkeypatch.setattr(vision, "tesserocr", None)
+    monkeypatch.setattr(vision.subprocess, "run", fake_run)
+    proc = np.zeros((8, 8), dtype=np.uint8)
+    assert vision._run_tesseract(proc, psm=8, whitelist="0123456789") == "42"
+    assert list(calls[0][-2:]) == ["-c", "tessedit_char_whitelist=0123456789"]
+
+
+@pytest.mark.parametrize("fft_min", [0, 100], ids=["fft", "spatial"])
+def test_batched_correlation_matches_opencv(tmp_path, monkeypatch, fft_min):
+    monkeypatch.setattr(vision, "_FFT_MIN_TEMPLATES", fft_min)
+    rng = np.random.default_rng(0)
+    templates_dir = tmp_path / "icons"
+    templates_dir.mkdir()
+    for i in range(3):
+        cv2.imwrite(str(templates_dir / f"icon_{i}.png"),
+                    rng.integers(0, 256, (12, 16, 3), dtype=np.uint8))
+    matcher = TemplateMatcher(templates_dir)
+    scene = rng.integers(0, 256, (70, 90, 3), dtype=np.uint8)
+    scene[10:40, 20:50] = 0  # flat patch: zero-variance windows
+
+    assert len(matcher.templates) == 3
+    bucket = matcher._buckets[0]
+    idx = np.arange(len(bucket.names))
+    # Score volume budget of two templates: chunks of 2 + 1
+    monkeypatch.setattr(vision, "_SCORE_BUDGET", 2 * (70 - 12 + 1) * (90 - 16 + 1))
+    chunks = list(matcher._correlate(bucket, idx, matcher.scene_stats(scene)))
+    assert [start for start, _ in chunks] == [0, 2]
+    assert all(scores.dtype == np.float32 for _, scores in chunks)
+    batched = np.concatenate([scores for _, scores in chunks])
+    gray_scene = cv2.cvtColor(scene, cv2.COLOR_BGR2GRAY)
+    for i, name in enumerate(bucket.names):
+        gray_template = cv2.cvtColor(matcher.templates[name], cv2.COLOR_BGR2GRAY)
+        expected = cv2.matchTemplate(gray_scene, gray_template, cv2.TM_CCOEFF_NORMED)
+        np.testing.assert_allclose(batched[i], expected, atol=1e-4)
+
+
+def test_roi_tile_matches_like_its_crop(tmp_path):
+    rng = np.random.default_rng(1)
+    templates_dir = tmp_path / "icons"
+    templates_dir.mkdir()
+    icon = rng.integers(0, 256, (10, 10, 3), dtype=np.uint8)
+    cv2.imwrite(str(templates_dir / "icon.png"), icon)
+    matcher = TemplateMatcher(templates_dir)
+
+    frame = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    frame[25:35, 40:50] = icon
+    direct = matcher.find_matches(frame[20:50, 30:70])
+    tiled = matcher.find_matches(frame, rois=[(30, 20, 70, 50)])
+    assert [(m.name, m.x, m.y) for m in direct] == [("icon", 10, 5)]
+    assert [(m.name, m.x - 30, m.y - 20) for m in tiled] == [("icon", 10, 5)]
+    assert tiled[0].confidence == pytest.approx(direct[0].confidence)
+
+
+def test_region_mean_from_integral_matches_numpy():
+    rng = np.random.default_rng(2)
+    gray = rng.integers(0, 256, (40, 50), dtype=np.uint8)
+    integ = cv2.integral(gray)
+    region = ScreenRegion(7, 5, 20, 12)
+    assert _region_mean(integ, region) == pytest.approx(gray[5:17, 7:27].mean())
+    # Regions running off the frame are clamped to it
+    edge = ScreenRegion(40, 30, 20, 20)
+    assert _region_mean(integ, edge) == pytest.approx(gray[30:, 40:].mean())
+
+
+def test_fuzzy_match_is_case_insensitive_with_cutoff():
+    choices = ["Kog'Maw", "Illaoi", "Jinx"]
+    name, ratio = _fuzzy_match("kogmaw", choices, 0.3)
+    assert name == "Kog'Maw" and 0.8 < ratio < 1.0
+    assert _fuzzy_match("zzzzzz", choices, 0.6) is None
+
+
+def test_hsv_class_counts_on_known_colours():
+    bar = np.zeros((20, 100, 3), dtype=np.uint8)
+    bar[:, :30] = (0, 0, 220)        # red
+    bar[:, 30:50] = (220, 40, 0)     # blue
+    bar[:, 50:60] = (240, 240, 240)  # white
+    assert list(_hsv_class_counts(bar, _DAMAGE_CLASSES)) == [800, 600, 400, 200]
+
+
+def test_color_scores_match_opencv(matcher):
+    rng = np.random.default_rng(4)
+    scene = rng.integers(0, 256, (50, 60, 3), dtype=np.uint8)
+    assert len(matcher.templates) == 2
+    bucket = matcher._buckets[0]
+    ys, xs = np.array([0, 7, 30]), np.array([0, 12, 40])
+    tmpl = np.array([0, 1, 0])
+    scores = matcher._color_scores(bucket, tmpl, ys, xs, scene)
+    for k, y, x, score in zip(tmpl, ys, xs, scores):
+        expected = cv2.matchTemplate(scene, bucket.stack[k], cv2.TM_CCOEFF_NORMED)[y, x]
+        assert score == pytest.approx(expected, abs=1e-4)
+
+
+def test_preprocess_accepts_gray_input():
+    bgr = np.random.default_rng(5).integers(0, 256, (10, 12, 3), dtype=np.uint8)
+    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    np.testing.assert_array_equal(_preprocess(gray, 3, "otsu"), _preprocess(bgr, 3, "otsu"))
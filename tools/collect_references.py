@@ -9,15 +9,25 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+_CAMERA = None
+
+
+def _get_cam():
+    """Return the shared dxcam camera, creating it on first use."""
+    global _CAMERA
+    if _CAMERA is None:
+        import dxcam
+        _CAMERA = dxcam.create(output_color="BGR")
+    return _CAMERA
+
 
 def take_screenshot(output_dir: Path):
     try:
-        import dxcam
+        camera = _get_cam()
     except ImportError:
         print("dxcam not available. Install: pip install dxcam")
         sys.exit(1)
 
-    camera = dxcam.create(output_color="BGR")
     frame = camera.grab()
     if frame is None:
         print("Failed to capture frame. Is a game running?")
@@ -28,7 +38,6 @@ def take_screenshot(output_dir: Path):
     out_path = output_dir / f"screenshot_{timestamp}.png"
     cv2.imwrite(str(out_path), frame)
     print(f"Saved: {out_path} ({frame.shape[1]}x{frame.shape[0]})")
-    del camera
 
 
 if __name__ == "__main__":
@@ -1,85 +1,129 @@
 #!/usr/bin/env python3
 """Debug board/bench champion detection: crop hex cells and bench slots, save annotated images."""
+import os
 import sys
 sys.path.insert(0, str(__import__("pathlib").Path(__file__).parent.parent))
 
 import cv2
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from overlay.config import TFTLayout
+from overlay.vision import _region_mean
 
 OUT_DIR = Path(__file__).parent.parent / "debug_crops"
 layout = TFTLayout()
 
+_CAMERA = None
+
+
+def _get_cam():
+    """Return the shared dxcam camera, creating it on first use."""
+    global _CAMERA
+    if _CAMERA is None:
+        import dxcam
+        _CAMERA = dxcam.create(output_color="BGR")
+    return _CAMERA
 
-def debug_bench(frame: np.ndarray):
-    """Crop and annotate bench champion slots."""
-    region = layout.champion_bench
-    bench_crop = frame[region.y:region.y + region.h,
-                       region.x:region.x + region.w]
-    cv2.imwrite(str(OUT_DIR / "bench_full.png"), bench_crop)
 
-    print(f"\n=== BENCH ===")
-    print(f"Region: x={region.x} y={region.y} w={region.w} h={region.h}")
+def _fast_write(path: Path, image: np.ndarray) -> bool:
+    """Write a transient debug PNG with the fastest zlib level."""
+    return cv2.imwrite(str(path), image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
 
-    num_slots = 9
-    slot_w = region.w // num_slots
-    annotated = bench_crop.copy()
 
-    for i in range(num_slots):
-        sx = i * slot_w
-        slot_crop = bench_crop[:, sx:sx + slot_w]
-        cv2.imwrite(str(OUT_DIR / f"bench_slot_{i}.png"), slot_crop)
+# PNG encoding releases the GIL, so crops are written on a per-call pool while
+# the analysis carries on. The frame is never modified, so crops are passed
+# as views without a copy.
+def _queue_write(writer: ThreadPoolExecutor, pending: dict, path: Path,
+                 image: np.ndarray):
+    """Write ``image`` to ``path`` on ``writer``, tracking it in ``pending``."""
+    pending[writer.submit(_fast_write, path, image)] = path
 
-        brightness = np.mean(cv2.cvtColor(slot_crop, cv2.COLOR_BGR2GRAY))
-        print(f"  Slot {i}: x={region.x + sx} brightness={brightness:.0f}")
 
-        cv2.rectangle(annotated, (sx, 0), (sx + slot_w, region.h),
-                      (0, 255, 0), 1)
-        cv2.putText(annotated, f"{i}", (sx + 5, 15),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
+def _report_writes(pending: dict):
+    """Wait for the queued writes and report any ``imwrite`` that failed."""
+    for future, path in pending.items():
+        if not future.result():
+            print(f"  Failed to write {path}")
 
-    cv2.imwrite(str(OUT_DIR / "bench_annotated.png"), annotated)
+
+def debug_bench(frame: np.ndarray):
+    """Crop and annotate bench champion slots."""
+    pending = {}
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as writer:
+        region = layout.champion_bench
+        bench_crop = frame[region.y:region.y + region.h,
+                           region.x:region.x + region.w]
+        _queue_write(writer, pending, OUT_DIR / "bench_full.png", bench_crop)
+
+        print(f"\n=== BENCH ===")
+        print(f"Region: x={region.x} y={region.y} w={region.w} h={region.h}")
+
+        num_slots = 9
+        slot_w = region.w // num_slots
+        annotated = bench_crop.copy()
+        bench_gray = cv2.cvtColor(bench_crop, cv2.COLOR_BGR2GRAY)
+        slot_brightness = bench_gray[:, :slot_w * num_slots].reshape(
+            bench_gray.shape[0], num_slots, slot_w).mean(axis=(0, 2))
+
+        for i, brightness in enumerate(slot_brightness):
+            sx = i * slot_w
+            slot_crop = bench_crop[:, sx:sx + slot_w]
+            _queue_write(writer, pending, OUT_DIR / f"bench_slot_{i}.png", slot_crop)
+
+            print(f"  Slot {i}: x={region.x + sx} brightness={brightness:.0f}")
+
+            cv2.rectangle(annotated, (sx, 0), (sx + slot_w, region.h),
+                          (0, 255, 0), 1)
+            cv2.putText(annotated, f"{i}", (sx + 5, 15),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 255, 0), 1)
+
+        _queue_write(writer, pending, OUT_DIR / "bench_annotated.png", annotated)
+    _report_writes(pending)
     print(f"  Saved bench_annotated.png + {num_slots} slot crops")
 
 
 def debug_board(frame: np.ndarray):
     """Crop and annotate board hex grid cells."""
-    hex_regions = layout.board_hex_regions
-    ox, oy = layout.board_hex_origin
-    max_x = max(r.x + r.w for r in hex_regions)
-    max_y = max(r.y + r.h for r in hex_regions)
-    board_crop = frame[oy:max_y, ox:max_x]
-    cv2.imwrite(str(OUT_DIR / "board_full.png"), board_crop)
-
-    print(f"\n=== BOARD ===")
-    print(f"Origin: ({ox}, {oy})")
-    print(f"Hex cells: {len(hex_regions)} "
-          f"({layout.board_hex_rows}x{layout.board_hex_cols})")
-
-    annotated = board_crop.copy()
-    cols = layout.board_hex_cols
-
-    for idx, region in enumerate(hex_regions):
-        row = idx // cols
-        col = idx % cols
-        cell_crop = frame[region.y:region.y + region.h,
-                          region.x:region.x + region.w]
-        cv2.imwrite(str(OUT_DIR / f"board_r{row}_c{col}.png"), cell_crop)
-
-        brightness = np.mean(cv2.cvtColor(cell_crop, cv2.COLOR_BGR2GRAY))
-        print(f"  Cell r{row}c{col}: x={region.x} y={region.y} "
-              f"brightness={brightness:.0f}")
-
-        rx = region.x - ox
-        ry = region.y - oy
-        cv2.rectangle(annotated, (rx, ry), (rx + region.w, ry + region.h),
-                      (0, 255, 0), 1)
-        cv2.putText(annotated, f"{row},{col}", (rx + 3, ry + 12),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.35, (0, 255, 0), 1)
-
-    cv2.imwrite(str(OUT_DIR / "board_annotated.png"), annotated)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as writer:
+        hex_regions = layout.board_hex_regions
+        ox, oy = layout.board_hex_origin
+        max_x = max(r.x + r.w for r in hex_regions)
+        max_y = max(r.y + r.h for r in hex_regions)
+        board_crop = frame[oy:max_y, ox:max_x]
+        _queue_write(writer, pending, OUT_DIR / "board_full.png", board_crop)
+
+        print(f"\n=== BOARD ===")
+        print(f"Origin: ({ox}, {oy})")
+        print(f"Hex cells: {len(hex_regions)} "
+              f"({layout.board_hex_rows}x{layout.board_hex_cols})")
+
+        annotated = board_crop.copy()
+        cols = layout.board_hex_cols
+        integ = cv2.integral(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+
+        for idx, region in enumerate(hex_regions):
+            row = idx // cols
+            col = idx % cols
+            cell_crop = frame[region.y:region.y + region.h,
+                              region.x:region.x + region.w]
+            _queue_write(writer, pending, OUT_DIR / f"board_r{row}_c{col}.png", cell_crop)
+
+            brightness = _region_mean(integ, region)
+            print(f"  Cell r{row}c{col}: x={region.x} y={region.y} "
+                  f"brightness={brightness:.0f}")
+
+            rx = region.x - ox
+            ry = region.y - oy
+            cv2.rectangle(annotated, (rx, ry), (rx + region.w, ry + region.h),
+                          (0, 255, 0), 1)
+            cv2.putText(annotated, f"{row},{col}", (rx + 3, ry + 12),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.35, (0, 255, 0), 1)
+
+        _queue_write(writer, pending, OUT_DIR / "board_annotated.png", annotated)
+    _report_writes(pending)
     print(f"  Saved board_annotated.png + {len(hex_regions)} cell crops")
 
 
@@ -94,13 +138,10 @@ def main():
         print(f"Loaded image: {path} ({frame.shape[1]}x{frame.shape[0]})")
     else:
         try:
-            import dxcam
-            cam = dxcam.create()
-            frame = cam.grab()
+            frame = _get_cam().grab()
             if frame is None:
                 print("dxcam grab returned None — is TFT visible?")
                 return
-            frame = cv2.cvtColor(np.array(frame), cv2.COLOR_RGB2BGR)
             print(f"Captured screen: {frame.shape[1]}x{frame.shape[0]}")
         except Exception as e:
             print(f"dxcam failed: {e}")
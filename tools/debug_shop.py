@@ -1,15 +1,19 @@
 #!/usr/bin/env python3
 """Debug shop OCR: capture screen, crop shop regions, run OCR, save crops."""
+import os
+import re
 import sys
 sys.path.insert(0, str(__import__("pathlib").Path(__file__).parent.parent))
 
 import cv2
 import numpy as np
 import pytesseract
+from pytesseract import Output
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from overlay.config import TFTLayout, ScreenRegion
-from overlay.vision import _ocr_text, _load_champion_names
+from overlay.vision import _fuzzy_match, _ocr_text, _load_champion_names
 
 # Set tesseract path on Windows
 if sys.platform == "win32":
@@ -20,6 +24,95 @@ if sys.platform == "win32":
 OUT_DIR = Path(__file__).parent.parent / "debug_crops"
 layout = TFTLayout()
 
+_CAMERA = None
+
+
+def _get_cam():
+    """Return the shared dxcam camera, creating it on first use."""
+    global _CAMERA
+    if _CAMERA is None:
+        import dxcam
+        _CAMERA = dxcam.create(output_color="BGR")
+    return _CAMERA
+
+
+SEP_H = 8  # black separator rows between stacked slots
+
+# Shop names are letters plus a few punctuation marks. The apostrophe is left
+# out: pytesseract splits the config with shlex, which can't carry a bare
+# quote on every platform, and the fuzzy match absorbs its absence.
+NAME_CONFIG = ("--psm 6 -c tessedit_char_whitelist="
+               "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz.-")
+GOOD_MATCH = 0.85  # adaptive matches at or above this skip the OTSU pass
+
+# Common tesseract confusions in name labels, then anything a name can't hold
+_OCR_TRANS = str.maketrans({"|": "I", "!": "I", "1": "I", "0": "O"})
+_OCR_RE = re.compile(r"[^A-Za-z '.-]")
+
+
+def _fast_write(path: Path, image: np.ndarray) -> bool:
+    """Write a transient debug PNG with the fastest zlib level."""
+    return cv2.imwrite(str(path), image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+
+
+# PNG encoding releases the GIL, so crops are written on a per-call pool while
+# the analysis carries on. The frame is never modified, so crops are passed
+# as views without a copy.
+def _queue_write(writer: ThreadPoolExecutor, pending: dict, path: Path,
+                 image: np.ndarray):
+    """Write ``image`` to ``path`` on ``writer``, tracking it in ``pending``."""
+    pending[writer.submit(_fast_write, path, image)] = path
+
+
+def _report_writes(pending: dict):
+    """Wait for the queued writes and report any ``imwrite`` that failed."""
+    for future, path in pending.items():
+        if not future.result():
+            print(f"  Failed to write {path}")
+
+
+def _montage_ocr(images: list[np.ndarray], config: str) -> list[str]:
+    """OCR all images in one tesseract call, returning one text line per image.
+
+    Images are stacked vertically with black separator rows and right padding,
+    matching the crops' black background (as _OcrBatch does) so no padding
+    merges with the white glyphs; words are mapped back to their image by the
+    ``top`` coordinate from ``image_to_data``.
+    """
+    if not images:
+        return []
+    width = max(img.shape[1] for img in images)
+    rows, bounds, y = [], [], 0
+    for img in images:
+        padded = np.zeros((img.shape[0], width), np.uint8)
+        padded[:, :img.shape[1]] = img
+        rows += [np.zeros((SEP_H, width), np.uint8), padded]
+        y += SEP_H
+        bounds.append((y, y + img.shape[0]))
+        y += img.shape[0]
+    rows.append(np.zeros((SEP_H, width), np.uint8))
+    big = np.vstack(rows)
+
+    data = pytesseract.image_to_data(big, config=config, output_type=Output.DICT)
+    words: list[list[str]] = [[] for _ in images]
+    for text, top, height in zip(data["text"], data["top"], data["height"]):
+        text = text.strip()
+        if not text:
+            continue
+        mid = top + height // 2
+        for i, (y0, y1) in enumerate(bounds):
+            if y0 - SEP_H <= mid < y1 + SEP_H:
+                words[i].append(text)
+                break
+    return [" ".join(w) for w in words]
+
+
+def _best_match(raw: str, champ_names: tuple[str, ...]) -> tuple[str | None, float]:
+    """Closest champion name for an OCR line, or (None, 0.0)."""
+    cleaned = _OCR_RE.sub("", raw.translate(_OCR_TRANS)).strip()
+    hit = _fuzzy_match(cleaned, champ_names, 0.3) if cleaned else None
+    return hit if hit is not None else (None, 0.0)
+
 
 def main():
     # Try dxcam first, fall back to a file argument
@@ -33,13 +126,10 @@ def main():
         print(f"Loaded image: {path} ({frame.shape[1]}x{frame.shape[0]})")
     else:
         try:
-            import dxcam
-            cam = dxcam.create()
-            frame = cam.grab()
+            frame = _get_cam().grab()
             if frame is None:
                 print("dxcam grab returned None — is TFT visible?")
                 return
-            frame = cv2.cvtColor(np.array(frame), cv2.COLOR_RGB2BGR)
             print(f"Captured screen: {frame.shape[1]}x{frame.shape[0]}")
         except Exception as e:
             print(f"dxcam failed: {e}")
@@ -50,50 +140,54 @@ def main():
     champ_names = _load_champion_names()
     print(f"Loaded {len(champ_names)} champion names for fuzzy match\n")
 
-    for i, region in enumerate(layout.shop_card_names):
-        crop = frame[region.y:region.y + region.h, region.x:region.x + region.w]
-        crop_path = OUT_DIR / f"shop_slot_{i}.png"
-        cv2.imwrite(str(crop_path), crop)
-
-        # Check if empty
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-        if gray.mean() < 15:
-            print(f"Slot {i}: EMPTY (avg brightness {gray.mean():.1f})")
-            continue
-
-        # Adaptive pass
-        scaled_a = cv2.resize(gray, None, fx=4, fy=4, interpolation=cv2.INTER_CUBIC)
-        proc_a = cv2.adaptiveThreshold(scaled_a, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                        cv2.THRESH_BINARY, 31, -10)
-        text_a = pytesseract.image_to_string(proc_a, config="--psm 11").strip()
-        text_a_line = text_a.split("\n")[0].strip() if text_a else ""
-        cv2.imwrite(str(OUT_DIR / f"shop_slot_{i}_adaptive.png"), proc_a)
-
-        # OTSU pass
-        scaled_o = cv2.resize(gray, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
-        _, proc_o = cv2.threshold(scaled_o, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        text_o = pytesseract.image_to_string(proc_o, config="--psm 11").strip()
-        text_o_line = text_o.split("\n")[0].strip() if text_o else ""
-        cv2.imwrite(str(OUT_DIR / f"shop_slot_{i}_otsu.png"), proc_o)
-
-        # Fuzzy match
-        from difflib import SequenceMatcher, get_close_matches
-        best_name = None
-        best_ratio = 0.0
-        for raw in [text_a_line, text_o_line]:
-            if not raw:
+    pending = {}
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as writer:
+        # Pre-pass: crop and threshold every non-empty slot
+        slots, adaptive, otsu = [], [], []
+        for i, region in enumerate(layout.shop_card_names):
+            crop = frame[region.y:region.y + region.h, region.x:region.x + region.w]
+            crop_path = OUT_DIR / f"shop_slot_{i}.png"
+            _queue_write(writer, pending, crop_path, crop)
+
+            # Check if empty
+            gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+            if gray.mean() < 15:
+                print(f"Slot {i}: EMPTY (avg brightness {gray.mean():.1f})")
                 continue
-            close = get_close_matches(raw, champ_names, n=1, cutoff=0.3)
-            if close:
-                ratio = SequenceMatcher(None, raw.lower(), close[0].lower()).ratio()
-                if ratio > best_ratio:
-                    best_ratio = ratio
-                    best_name = close[0]
-
-        print(f"Slot {i}: adaptive='{text_a_line}' otsu='{text_o_line}' "
-              f"-> match='{best_name}' ({best_ratio:.2f})")
-        print(f"  coords: x={region.x} y={region.y} w={region.w} h={region.h}")
 
+            # Adaptive pass
+            scaled_a = cv2.resize(gray, None, fx=4, fy=4, interpolation=cv2.INTER_CUBIC)
+            proc_a = cv2.adaptiveThreshold(scaled_a, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                            cv2.THRESH_BINARY, 31, -10)
+            _queue_write(writer, pending, OUT_DIR / f"shop_slot_{i}_adaptive.png", proc_a)
+
+            # OTSU pass
+            scaled_o = cv2.resize(gray, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
+            _, proc_o = cv2.threshold(scaled_o, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            _queue_write(writer, pending, OUT_DIR / f"shop_slot_{i}_otsu.png", proc_o)
+
+            slots.append((i, region))
+            adaptive.append(proc_a)
+            otsu.append(proc_o)
+
+        # One tesseract call for the adaptive pass; OTSU only re-reads weak slots
+        texts_a = _montage_ocr(adaptive, NAME_CONFIG)
+        results = [_best_match(t, champ_names) for t in texts_a]
+        texts_o = [""] * len(slots)
+        retry = [k for k, (_, ratio) in enumerate(results) if ratio < GOOD_MATCH]
+        for k, text in zip(retry, _montage_ocr([otsu[k] for k in retry], NAME_CONFIG)):
+            texts_o[k] = text
+            name, ratio = _best_match(text, champ_names)
+            if ratio > results[k][1]:
+                results[k] = (name, ratio)
+
+        for (i, region), text_a_line, text_o_line, (best_name, best_ratio) in zip(
+                slots, texts_a, texts_o, results):
+            print(f"Slot {i}: adaptive='{text_a_line}' otsu='{text_o_line}' "
+                  f"-> match='{best_name}' ({best_ratio:.2f})")
+            print(f"  coords: x={region.x} y={region.y} w={region.w} h={region.h}")
+
+    _report_writes(pending)
     print(f"\nCrops saved to: {OUT_DIR}/")
 
 
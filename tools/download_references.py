@@ -3,15 +3,22 @@
 Download champion, item, and augment reference icons from Community Dragon.
 These are used by the vision engine for template matching.
 """
+import http.client
 import json
 import tempfile
-import urllib.request
+import threading
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import urlsplit
 
 CDN_BASE = "https://raw.communitydragon.org/latest/game/"
 CDRAGON_CACHE = Path(tempfile.gettempdir()) / "cdragon_tft.json"
 REFERENCES_DIR = Path(__file__).parent.parent / "references"
+DOWNLOAD_WORKERS = 16
+
+# One keep-alive connection per worker thread and host
+_local = threading.local()
 
 
 def tex_to_url(tex_path: str) -> str:
@@ -19,18 +26,55 @@ def tex_to_url(tex_path: str) -> str:
     return CDN_BASE + tex_path.lower().replace(".tex", ".png")
 
 
+def _connection(host: str) -> http.client.HTTPSConnection:
+    conns = _local.__dict__.setdefault("conns", {})
+    if host not in conns:
+        conns[host] = http.client.HTTPSConnection(host, timeout=10)
+    return conns[host]
+
+
+def _get(conn: http.client.HTTPSConnection, target: str) -> bytes:
+    conn.request("GET", target, headers={"User-Agent": "Mozilla/5.0"})
+    resp = conn.getresponse()
+    body = resp.read()
+    if resp.status != 200:
+        raise OSError(f"HTTP {resp.status} {resp.reason}")
+    return body
+
+
 def download(url: str, dest: Path) -> bool:
     """Download a URL to a file. Returns True on success."""
+    parts = urlsplit(url)
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    conn = _connection(parts.netloc)
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req) as resp:
-            dest.write_bytes(resp.read())
+        try:
+            body = _get(conn, target)
+        except (http.client.RemoteDisconnected, ConnectionResetError):
+            # The CDN dropped the idle keep-alive connection: retry once
+            conn.close()
+            body = _get(conn, target)
+        dest.write_bytes(body)
         return True
     except Exception as e:
+        conn.close()  # reconnects on the next request
         print(f"  FAILED: {url} — {e}")
         return False
 
 
+def download_all(jobs: list[tuple[str, Path, str | None]]) -> int:
+    """Download ``(url, dest, label)`` jobs concurrently; returns the success count.
+
+    Labels of successful downloads are printed, in job order.
+    """
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        results = list(pool.map(lambda job: download(job[0], job[1]), jobs))
+    for (_, _, label), done in zip(jobs, results):
+        if done and label:
+            print(f"  {label}")
+    return sum(results)
+
+
 def main():
     with open(CDRAGON_CACHE, encoding="utf-8") as f:
         data = json.load(f)
@@ -48,6 +92,7 @@ def main():
 
     print(f"Downloading {len(champs)} champion icons...")
     ok = 0
+    jobs = []
     for c in champs:
         icon = c.get("tileIcon") or c.get("squareIcon") or c.get("icon", "")
         if not icon:
@@ -57,10 +102,8 @@ def main():
         if dest.exists():
             ok += 1
             continue
-        url = tex_to_url(icon)
-        if download(url, dest):
-            ok += 1
-            print(f"  {c['name']}")
+        jobs.append((tex_to_url(icon), dest, c["name"]))
+    ok += download_all(jobs)
     print(f"  {ok}/{len(champs)} champion icons downloaded\n")
 
     # Download item component icons
@@ -81,6 +124,7 @@ def main():
 
     print(f"Downloading {len(unique_components)} item component icons...")
     ok = 0
+    jobs = []
     for i in unique_components:
         icon = i.get("icon", "")
         if not icon:
@@ -89,10 +133,8 @@ def main():
         if dest.exists():
             ok += 1
             continue
-        url = tex_to_url(icon)
-        if download(url, dest):
-            ok += 1
-            print(f"  {i['name']}")
+        jobs.append((tex_to_url(icon), dest, i["name"]))
+    ok += download_all(jobs)
     print(f"  {ok}/{len(unique_components)} component icons downloaded\n")
 
     # Download completed item icons (non-component, non-augment, with recipes)
@@ -104,14 +146,14 @@ def main():
                  and i.get("icon")]
     print(f"Downloading {len(completed)} completed item icons...")
     ok = 0
+    jobs = []
     for i in completed:
         dest = item_dir / f"{i['apiName']}.png"
         if dest.exists():
             ok += 1
             continue
-        url = tex_to_url(i["icon"])
-        if download(url, dest):
-            ok += 1
+        jobs.append((tex_to_url(i["icon"]), dest, None))
+    ok += download_all(jobs)
     print(f"  {ok}/{len(completed)} completed item icons downloaded\n")
 
     # Download augment icons (Tocker's augments only)
@@ -125,18 +167,16 @@ def main():
 
     print(f"Downloading {len(augments)} augment icons...")
     ok = 0
-    skip = 0
+    jobs = []
     for a in augments:
         dest = aug_dir / f"{a['apiName']}.png"
         if dest.exists():
             ok += 1
             continue
-        url = tex_to_url(a["icon"])
-        if download(url, dest):
-            ok += 1
-            print(f"  {a.get('name', a['apiName'])}")
-        else:
-            skip += 1
+        jobs.append((tex_to_url(a["icon"]), dest, a.get("name", a["apiName"])))
+    done = download_all(jobs)
+    ok += done
+    skip = len(jobs) - done
     print(f"  {ok}/{len(augments)} augment icons downloaded ({skip} failed)\n")
 
     print("Done! Reference images saved to:", REFERENCES_DIR)
@@ -30,11 +30,34 @@ def fetch_text(host: str, port: int, path: str) -> str:
     return bridge_cmd(host, port, f"readtext {path}").decode("utf-8", errors="replace")
 
 
-def fetch_binary(host: str, port: int, path: str) -> bytes:
-    raw = bridge_cmd(host, port, f"read {path}")
-    # Response starts with "SIZE <n>\n" followed by binary data
-    header_end = raw.index(b"\n") + 1
-    return raw[header_end:]
+def fetch_binary(host: str, port: int, path: str) -> bytearray:
+    """Fetch a file, receiving its payload straight into a preallocated buffer."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(10)
+        s.connect((host, port))
+        s.sendall(f"read {path}\n".encode())
+        s.shutdown(socket.SHUT_WR)
+        # Response starts with "SIZE <n>\n" followed by binary data
+        head = b""
+        while b"\n" not in head:
+            chunk = s.recv(256)
+            if not chunk:
+                break
+            head += chunk
+        line, _, rest = head.partition(b"\n")
+        if not line.startswith(b"SIZE "):
+            return bytearray()
+        size = int(line[5:])
+        data = bytearray(size)
+        view = memoryview(data)
+        got = len(rest)
+        view[:got] = rest
+        while got < size:
+            n = s.recv_into(view[got:], min(size - got, 65536))
+            if not n:
+                raise ConnectionError(f"{path}: connection closed after {got}/{size} bytes")
+            got += n
+    return data
 
 
 def list_dir(host: str, port: int, path: str) -> list[str]:
@@ -6,7 +6,7 @@ Listens on a TCP port so a remote machine (e.g. Claude's dev environment)
 can read files from the project directory over the network.
 
 Usage:
-    python tools/file_bridge.py [--port 9100] [--host 0.0.0.0]
+    python tools/file_bridge.py [--port 9100] [--host 0.0.0.0] [--workers N]
 
 Then from the remote machine:
     echo "list debug_crops" | nc <your-windows-ip> 9100
@@ -17,9 +17,16 @@ Protocol:
     - Commands:
         ping                → "pong"
         list <dir>          → newline-separated file list
+        listgz <dir>        → "GZIP <bytes>\n" followed by the list, gzipped
         read <path>         → "SIZE <bytes>\n" followed by raw binary
-        readtext <path>     → file contents as UTF-8 text
+        readrange <path> <offset> <length>
+                            → "SIZE <length>\n" followed by that slice
+        readtext <path>     → file contents as stored (UTF-8 text)
+        readtext-sanitize <path>
+                            → file contents with invalid UTF-8 replaced
     - Paths are relative to the project root
+    - Commands are handled by overlay/bridge.py, the same code the companion
+      embeds; this script only adds the standalone CLI and --workers
 
 Security:
     - No authentication — only run on trusted networks.
@@ -27,115 +34,46 @@ Security:
 """
 
 import argparse
-import os
+import multiprocessing
 import socket
 import sys
-import threading
-import time
 from pathlib import Path
 
-PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-
-def safe_path(rel_path: str) -> Path | None:
-    """Resolve a relative path and ensure it's within the project root."""
-    try:
-        full = (PROJECT_ROOT / rel_path).resolve()
-        if not str(full).startswith(str(PROJECT_ROOT)):
-            return None
-        return full
-    except (ValueError, OSError):
-        return None
+from overlay.bridge import PROJECT_ROOT, _accept_loop, _bind, _start_logger
 
 
-def handle_client(conn, addr):
-    print(f"[{time.strftime('%H:%M:%S')}] Connection from {addr}")
+def _serve(server: socket.socket):
+    """Accept until Ctrl+C, handing connections to a bounded thread pool."""
+    _start_logger()
     try:
-        conn.settimeout(30)
-        data = b""
-        while b"\n" not in data and len(data) < 4096:
-            chunk = conn.recv(4096)
-            if not chunk:
-                break
-            data += chunk
-
-        if not data:
-            return
-
-        command = data.decode("utf-8", errors="replace").strip()
-        print(f"[{time.strftime('%H:%M:%S')}] Command: {command}")
-
-        if not command:
-            conn.sendall(b"ERROR: empty command\n")
-            return
-
-        if command == "ping":
-            conn.sendall(b"pong\n")
-            return
-
-        if command.startswith("list "):
-            rel_dir = command[5:].strip()
-            path = safe_path(rel_dir)
-            if path is None or not path.is_dir():
-                conn.sendall(f"ERROR: directory not found: {rel_dir}\n".encode())
-                return
-            files = sorted(p.name for p in path.iterdir() if p.is_file())
-            conn.sendall(("\n".join(files) + "\n").encode())
-            return
-
-        if command.startswith("read "):
-            rel_file = command[5:].strip()
-            path = safe_path(rel_file)
-            if path is None or not path.is_file():
-                conn.sendall(f"ERROR: file not found: {rel_file}\n".encode())
-                return
-            size = path.stat().st_size
-            conn.sendall(f"SIZE {size}\n".encode())
-            with open(path, "rb") as f:
-                while True:
-                    chunk = f.read(65536)
-                    if not chunk:
-                        break
-                    conn.sendall(chunk)
-            return
-
-        if command.startswith("readtext "):
-            rel_file = command[9:].strip()
-            path = safe_path(rel_file)
-            if path is None or not path.is_file():
-                conn.sendall(f"ERROR: file not found: {rel_file}\n".encode())
-                return
-            text = path.read_text(encoding="utf-8", errors="replace")
-            conn.sendall(text.encode("utf-8"))
-            return
-
-        conn.sendall(b"ERROR: unknown command. Use: ping, list <dir>, read <path>, readtext <path>\n")
-
-    except socket.timeout:
-        print(f"[{time.strftime('%H:%M:%S')}] Client {addr} timed out")
-    except Exception as e:
-        print(f"[{time.strftime('%H:%M:%S')}] Error handling {addr}: {e}")
-        try:
-            conn.sendall(f"ERROR: {e}\n".encode())
-        except Exception:
-            pass
+        _accept_loop(server, max_workers=32)
+    except KeyboardInterrupt:
+        pass
     finally:
-        conn.close()
+        server.close()
+
 
+def _worker(host: str, port: int):
+    _serve(_bind(host, port, reuse_port=True))
 
-def main():
+
+def main(argv: list[str] | None = None):
     parser = argparse.ArgumentParser(description="File Bridge Server")
     parser.add_argument("--port", type=int, default=9100,
                         help="TCP port to listen on (default: 9100)")
     parser.add_argument("--host", default="0.0.0.0",
                         help="Host to bind to (default: 0.0.0.0)")
-    args = parser.parse_args()
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Acceptor processes sharing the port (default: 1)")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+        parser.error("--workers needs SO_REUSEPORT, which this platform lacks")
 
-    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    server.settimeout(1.0)  # Allow Ctrl+C to interrupt on Windows
-    server.bind((args.host, args.port))
-    server.listen(5)
+    server = _bind(args.host, args.port, reuse_port=args.workers > 1)
 
     # Show local IPs for convenience
     hostname = socket.gethostname()
@@ -146,6 +84,8 @@ def main():
 
     print(f"File Bridge serving: {PROJECT_ROOT}")
     print(f"Listening on {args.host}:{args.port}")
+    if args.workers > 1:
+        print(f"Workers: {args.workers}")
     print(f"Local IP: {local_ip}")
     print(f"\nFrom remote machine:")
     print(f'  echo "ping" | nc {local_ip} {args.port}')
@@ -153,19 +93,13 @@ def main():
     print(f'  echo "read debug_crops/shop_slot_0.png" | nc {local_ip} {args.port} > file.png')
     print(f"\nPress Ctrl+C to stop.\n")
 
-    try:
-        while True:
-            try:
-                conn, addr = server.accept()
-            except socket.timeout:
-                continue
-            thread = threading.Thread(target=handle_client, args=(conn, addr),
-                                     daemon=True)
-            thread.start()
-    except KeyboardInterrupt:
-        print("\nShutting down.")
-    finally:
-        server.close()
+    # Each extra worker runs its own accept loop and pool; daemonic, so they
+    # go down with this process
+    for _ in range(args.workers - 1):
+        multiprocessing.Process(target=_worker, args=(args.host, args.port),
+                                daemon=True).start()
+    _serve(server)
+    print("\nShutting down.")
 
 
 if __name__ == "__main__":